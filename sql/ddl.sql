@@ -216,6 +216,10 @@ CREATE TABLE price_data
 -- 하이퍼테이블로 변환
 SELECT create_hypertable('price_data', 'time');
 
+-- 종목별 기간 조회용 커버링 인덱스 (종가, 수정 종가, 거래량만 읽는 조회는 인덱스만으로 처리)
+CREATE INDEX idx_price_data_symbol_time_covering
+    ON price_data (symbol, time) INCLUDE (close, adjusted_close, volume);
+
 -- 경기 사이클 정보
 CREATE TABLE economic_cycle
 (
@@ -155,23 +155,17 @@ class TrendAnalyzer:
         if len(prices) < 50:
             return {"consistency": 0.5, "reversals": 0}
         
-        # Count trend reversals
+        # Count trend reversals: changes of side of the 50-day SMA, ignoring days on
+        # (or before) the average since they keep the previous trend
         reversals = 0
-        current_trend = None
-        
-        for i in range(20, len(prices)):
-            if "sma_50" in moving_averages:
-                sma_50 = prices.rolling(window=50).mean().iloc[i]
-                price = prices.iloc[i]
-                
-                if price > sma_50:
-                    if current_trend == "down":
-                        reversals += 1
-                    current_trend = "up"
-                elif price < sma_50:
-                    if current_trend == "up":
-                        reversals += 1
-                    current_trend = "down"
+        
+        if "sma_50" in moving_averages:
+            values = prices.to_numpy(dtype=np.float64)
+            sma_50 = prices.rolling(window=50).mean().to_numpy()
+            side = np.sign(values[20:] - sma_50[20:])
+            side = side[side != 0]
+            side = side[~np.isnan(side)]
+            reversals = int(np.count_nonzero(side[1:] != side[:-1]))
         
         # Calculate consistency score
         total_periods = len(prices) - 20
@@ -257,25 +251,17 @@ class TrendAnalyzer:
         if len(prices) < 20:
             return 0
         
-        duration = 0
-        current_price = prices.iloc[-1]
+        values = prices.to_numpy(dtype=np.float64)
+        if trend_direction == TrendDirection.UP:
+            moves = values[1:] > values[:-1]
+        elif trend_direction == TrendDirection.DOWN:
+            moves = values[1:] < values[:-1]
+        else:
+            return 0
         
-        # Count consecutive periods in the same direction
-        for i in range(len(prices) - 1, 0, -1):
-            if trend_direction == TrendDirection.UP:
-                if prices.iloc[i] > prices.iloc[i-1]:
-                    duration += 1
-                else:
-                    break
-            elif trend_direction == TrendDirection.DOWN:
-                if prices.iloc[i] < prices.iloc[i-1]:
-                    duration += 1
-                else:
-                    break
-            else:
-                break
-        
-        return duration
+        # Count consecutive periods in the same direction, back from the latest one
+        breaks = np.flatnonzero(~moves)
+        return int(moves.size - 1 - breaks[-1]) if breaks.size else int(moves.size)
     
     def get_trend_forecast(self, prices: pd.Series, periods: int = 10) -> Dict[str, Any]:
         """Generate trend forecast for the next N periods."""
@@ -15,11 +15,9 @@ from mcp.server import main as mcp_main
 
 def main():
     """Main entry point."""
-    # Setup configuration
-    config = get_config()
-    
+    # Setup configuration; settings are validated as they are loaded
     try:
-        config.validate()
+        config = get_config()
     except ValueError as e:
         print(f"Configuration error: {e}")
         sys.exit(1)
@@ -6,7 +6,8 @@ import logging
 from typing import Dict, Any, List
 from datetime import datetime
 
-from mcp import Server, StdioServerParameters
+from mcp import StdioServerParameters
+from mcp.server import Server
 from mcp.server.models import InitializationOptions
 
 from .tools import (
@@ -27,6 +28,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Tools are stateless, so a single set of instances is shared by every server
+TOOLS = (
+    StockInfoTool(),
+    MarketScreenerTool(),
+    TechnicalAnalysisTool(),
+    TradingSignalTool(),
+    SignalBacktestTool(),
+    PortfolioTool(),
+    RiskAnalysisTool()
+)
+
 
 class TrendFollowingMCPServer:
     """Trend Following MCP Server implementation."""
@@ -34,15 +46,7 @@ class TrendFollowingMCPServer:
     def __init__(self):
         """Initialize the MCP server."""
         self.server = Server("trend-following-mcp")
-        self.tools = [
-            StockInfoTool(),
-            MarketScreenerTool(),
-            TechnicalAnalysisTool(),
-            TradingSignalTool(),
-            SignalBacktestTool(),
-            PortfolioTool(),
-            RiskAnalysisTool()
-        ]
+        self.tools = list(TOOLS)
         
         # Register tools
         for tool in self.tools:
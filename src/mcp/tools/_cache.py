@@ -0,0 +1,209 @@
+"""Caching layer for yfinance requests shared by the MCP tools."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+
+CACHE_DIR = Path(os.getenv("TREND_MCP_CACHE_DIR", str(Path.home() / ".trademonster" / "cache")))
+
+HISTORY_TTL = 24 * 60 * 60  # 1 day
+INFO_TTL = 90 * 24 * 60 * 60  # 90 days
+QUOTE_TTL = 5 * 60  # 5 minutes, for short lookbacks used as live quotes
+
+FAST_INFO_KEYS = ("marketCap", "yearHigh", "yearLow", "threeMonthAverageVolume")
+
+MEMORY_CACHE_SIZE = 512  # responses kept in process
+
+# Plain tickers only (e.g. AAPL, BRK.B, ^GSPC, EURUSD=X, BTC-USD); symbols become cache directory names
+_SYMBOL_PATTERN = re.compile(r"^[A-Z0-9^][A-Z0-9.^=-]{0,19}$")
+
+
+def check_symbol(symbol: str) -> str:
+    """Return the symbol if it is a plain ticker, otherwise raise ValueError."""
+    if not isinstance(symbol, str) or not _SYMBOL_PATTERN.match(symbol):
+        raise ValueError(f"Invalid symbol: {symbol!r}")
+    return symbol
+
+
+def _json_default(value: Any) -> Any:
+    """Convert NumPy scalars for JSON; anything else is left unserializable."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode(data: Any) -> Dict[str, Any]:
+    """Encode a payload as JSON-compatible data, splitting DataFrames into index, columns and values."""
+    if not isinstance(data, pd.DataFrame):
+        return {"kind": "json", "data": data}
+    
+    index = data.index
+    if isinstance(index, pd.DatetimeIndex):
+        # Integer ticks in the index's own resolution, plus its time zone
+        index_values = index.asi8.tolist()
+        unit = index.unit
+        tz = str(index.tz) if index.tz is not None else None
+    else:
+        index_values = index.tolist()
+        unit = tz = None
+    return {
+        "kind": "frame",
+        "columns": [str(column) for column in data.columns],
+        "dtypes": [str(dtype) for dtype in data.dtypes],
+        "index": index_values,
+        "index_name": index.name,
+        "datetime_index": isinstance(index, pd.DatetimeIndex),
+        "unit": unit,
+        "tz": tz,
+        "data": [data[column].tolist() for column in data.columns]
+    }
+
+
+def _decode(payload: Dict[str, Any]) -> Any:
+    """Rebuild a payload written by ``_encode``."""
+    if payload["kind"] != "frame":
+        return payload["data"]
+    
+    if payload["datetime_index"]:
+        unit = payload["unit"]
+        index = pd.to_datetime(payload["index"], unit=unit, utc=payload["tz"] is not None).as_unit(unit)
+        if payload["tz"] is not None:
+            index = index.tz_convert(payload["tz"])
+    else:
+        index = pd.Index(payload["index"])
+    index.name = payload["index_name"]
+    return pd.DataFrame(
+        {
+            column: np.asarray(values, dtype=dtype)
+            for column, dtype, values in zip(payload["columns"], payload["dtypes"], payload["data"], strict=True)
+        },
+        index=index
+    )
+
+
+class FileCache:
+    """On-disk cache of JSON payloads stored under ``{root}/{symbol}/{endpoint}_{hash}.json``."""
+
+    def __init__(self, root: Path):
+        """Initialize the file cache."""
+        self.root = root
+
+    def _path(self, symbol: str, endpoint: str, params: Tuple[Tuple[str, Any], ...]) -> Path:
+        """Build the cache file path for a request."""
+        digest = hashlib.md5(repr(params).encode()).hexdigest()
+        return self.root / check_symbol(symbol) / f"{endpoint}_{digest}.json"
+
+    def get(self, symbol: str, endpoint: str, params: Tuple[Tuple[str, Any], ...], ttl: float) -> Optional[Tuple[float, Any]]:
+        """Return the stored timestamp and payload, or None if missing or older than ``ttl`` seconds."""
+        path = self._path(symbol, endpoint, params)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry["ts"] > ttl:
+                return None
+            return entry["ts"], _decode(entry["payload"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def set(self, symbol: str, endpoint: str, params: Tuple[Tuple[str, Any], ...], data: Any) -> None:
+        """Store a payload; failures only cost a future cache miss."""
+        path = self._path(symbol, endpoint, params)
+        try:
+            text = json.dumps({"ts": time.time(), "payload": _encode(data)}, default=_json_default)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        except (OSError, ValueError, TypeError):
+            pass
+
+
+file_cache = FileCache(CACHE_DIR)
+
+_tickers: Dict[str, yf.Ticker] = {}
+_memory: "OrderedDict[Tuple[str, str, Tuple[Tuple[str, Any], ...]], Tuple[float, Any]]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def get_ticker(symbol: str) -> yf.Ticker:
+    """Get a shared Ticker instance for the symbol."""
+    check_symbol(symbol)
+    ticker = _tickers.get(symbol)
+    if ticker is None:
+        ticker = _tickers[symbol] = yf.Ticker(symbol)
+    return ticker
+
+
+def _cached(symbol: str, endpoint: str, params: Tuple[Tuple[str, Any], ...], ttl: float, fetch) -> Any:
+    """Look a request up in memory, then on disk, and fetch it on a miss."""
+    check_symbol(symbol)
+    key = (symbol, endpoint, params)
+    with _memory_lock:
+        hit = _memory.get(key)
+        if hit is not None and time.time() - hit[0] <= ttl:
+            _memory.move_to_end(key)
+            return hit[1]
+
+    # A disk hit keeps its stored timestamp so it expires when the file entry does
+    hit = file_cache.get(symbol, endpoint, params, ttl)
+    if hit is None:
+        data = fetch()
+        # Don't cache failed lookups
+        if data is None or (isinstance(data, pd.DataFrame) and data.empty):
+            return data
+        file_cache.set(symbol, endpoint, params, data)
+        hit = (time.time(), data)
+    ts, data = hit
+
+    # Least recently used responses are evicted once the cache is full
+    with _memory_lock:
+        _memory[key] = (ts, data)
+        _memory.move_to_end(key)
+        if len(_memory) > MEMORY_CACHE_SIZE:
+            _memory.popitem(last=False)
+    return data
+
+
+def cached_history(symbol: str, ttl: float = HISTORY_TTL, **kwargs: Any) -> pd.DataFrame:
+    """Get price history for the symbol, keyed by the history() arguments."""
+    params = tuple(sorted(kwargs.items()))
+    return _cached(symbol, "history", params, ttl, lambda: get_ticker(symbol).history(**kwargs))
+
+
+def cached_info(symbol: str, ttl: float = INFO_TTL) -> Dict[str, Any]:
+    """Get the info dictionary for the symbol."""
+    return _cached(symbol, "info", (), ttl, lambda: get_ticker(symbol).info)
+
+
+def _fetch_fast_info(symbol: str) -> Dict[str, Any]:
+    """Read the quote fields served by the lightweight fast_info endpoint."""
+    fast_info = get_ticker(symbol).fast_info
+    data = {}
+    for key in FAST_INFO_KEYS:
+        try:
+            data[key] = fast_info[key]
+        except Exception:
+            data[key] = None
+    return data
+
+
+def cached_fast_info(symbol: str, ttl: float = QUOTE_TTL) -> Dict[str, Any]:
+    """Get market cap, 52-week range and average volume without the full info scrape."""
+    return _cached(symbol, "fast_info", (), ttl, lambda: _fetch_fast_info(symbol))
+
+
+def clear_cache() -> None:
+    """Drop the in-process Ticker and response caches."""
+    _tickers.clear()
+    with _memory_lock:
+        _memory.clear()
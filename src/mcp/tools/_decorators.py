@@ -0,0 +1,23 @@
+"""Shared decorators for MCP tools."""
+
+import functools
+from typing import Any, Awaitable, Callable, Dict
+
+
+ExecuteFn = Callable[[Any, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+def mcp_execute(failure_message: str) -> Callable[[ExecuteFn], ExecuteFn]:
+    """Convert exceptions raised by a tool's execute method into an error response."""
+    def decorator(func: ExecuteFn) -> ExecuteFn:
+        @functools.wraps(func)
+        async def wrapper(self: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                return await func(self, params)
+            except Exception as e:
+                return {
+                    "error": f"{failure_message}: {str(e)}",
+                    "success": False
+                }
+        return wrapper
+    return decorator
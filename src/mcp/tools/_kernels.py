@@ -0,0 +1,326 @@
+"""Numerical kernels for technical indicators.
+
+The kernels work on plain NumPy arrays and are compiled with numba when it is
+installed; without numba they run as regular Python functions. Accumulators are
+float64 so float32 inputs give float64 results either way. Array predicates are
+fused with numexpr, and exponential averages fall back to scipy's lfilter when
+numba is missing, if those are installed.
+"""
+
+import os
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+# Keep compiled kernels in a per-user cache so restarts and new installs reuse them;
+# must be set before numba is imported
+os.environ.setdefault("NUMBA_CACHE_DIR", str(Path.home() / ".trademonster" / "numba_cache"))
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+try:
+    import numexpr
+except ImportError:  # numexpr is optional
+    numexpr = None
+
+try:
+    from scipy.signal import lfilter
+except ImportError:  # scipy is optional
+    lfilter = None
+
+
+@njit(cache=True)
+def sma_last(values: np.ndarray, window: int) -> float:
+    """Simple moving average of the last ``window`` values."""
+    n = values.size
+    if n < window:
+        return np.nan
+    total = np.float64(0.0)
+    for i in range(n - window, n):
+        total += values[i]
+    return total / window
+
+
+def sma_full(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average series, NaN until the first full window."""
+    out = np.full(values.size, np.nan)
+    if values.size < window:
+        return out
+    if window > 100:
+        # Cumulative-sum form stays O(N) for long windows
+        csum = np.cumsum(np.insert(values.astype(np.float64), 0, 0.0))
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    else:
+        out[window - 1:] = np.convolve(values, np.ones(window) / window, mode="valid")
+    return out
+
+
+def trend_signals(close: np.ndarray, fast: np.ndarray, slow: np.ndarray) -> np.ndarray:
+    """Per-bar moving average alignment signal: 1 = buy, -1 = sell, 0 = hold."""
+    if numexpr is not None:
+        # One fused pass instead of a temporary array per comparison
+        signals = numexpr.evaluate(
+            "where((close > fast) & (fast > slow), 1, where((close < fast) & (fast < slow), -1, 0))"
+        )
+    else:
+        signals = np.where(
+            (close > fast) & (fast > slow), 1,
+            np.where((close < fast) & (fast < slow), -1, 0)
+        )
+    return signals.astype(np.int8)
+
+
+@njit(cache=True)
+def bb_last(values: np.ndarray, period: int, num_std: float) -> Tuple[float, float, float]:
+    """Last Bollinger Bands (upper, middle, lower) using the sample standard deviation."""
+    n = values.size
+    if n < period:
+        return np.nan, np.nan, np.nan
+    total = np.float64(0.0)
+    for i in range(n - period, n):
+        total += values[i]
+    middle = total / period
+    sq_dev = np.float64(0.0)
+    for i in range(n - period, n):
+        sq_dev += (values[i] - middle) ** 2
+    std = (sq_dev / (period - 1)) ** 0.5
+    return middle + num_std * std, middle, middle - num_std * std
+
+
+@njit(cache=True)
+def stoch_last(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, k_period: int, d_period: int
+) -> Tuple[float, float]:
+    """Last Stochastic Oscillator (%K, %D), only evaluating the windows %D averages."""
+    n = close.size
+    k = np.nan
+    d_total = np.float64(0.0)
+    for end in range(n - d_period + 1, n + 1):
+        if end < k_period:
+            d_total = np.nan
+            continue
+        lowest = low[end - k_period]
+        highest = high[end - k_period]
+        for i in range(end - k_period + 1, end):
+            lowest = min(lowest, low[i])
+            highest = max(highest, high[i])
+        price_range = highest - lowest
+        k = 100.0 * (close[end - 1] - lowest) / price_range if price_range != 0 else np.nan
+        d_total += k
+    if n < k_period:
+        return np.nan, np.nan
+    return k, d_total / d_period
+
+
+@njit(cache=True)
+def rsi_last(close: np.ndarray, period: int) -> float:
+    """Last RSI value with Wilder's smoothing."""
+    n = close.size
+    if n <= period:
+        return np.nan
+    avg_gain = np.float64(0.0)
+    avg_loss = np.float64(0.0)
+    for i in range(1, period + 1):
+        change = close[i] - close[i - 1]
+        if change > 0:
+            avg_gain += change
+        else:
+            avg_loss -= change
+    avg_gain /= period
+    avg_loss /= period
+    for i in range(period + 1, n):
+        change = close[i] - close[i - 1]
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    if avg_loss == 0.0:
+        return 100.0 if avg_gain > 0.0 else np.nan
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True)
+def atr_last(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> float:
+    """Mean true range over the last ``period`` bars."""
+    n = close.size
+    if n <= period:
+        return np.nan
+    total = np.float64(0.0)
+    for i in range(n - period, n):
+        prev_close = close[i - 1]
+        total += max(high[i] - low[i], abs(high[i] - prev_close), abs(low[i] - prev_close))
+    return total / period
+
+
+@njit(cache=True)
+def _obv_last_loop(close: np.ndarray, volume: np.ndarray) -> float:
+    """Last On-Balance Volume value from a single compiled loop."""
+    if close.size == 0:
+        return np.nan
+    total = np.float64(volume[0])
+    for i in range(1, close.size):
+        if close[i] > close[i - 1]:
+            total += volume[i]
+        elif close[i] < close[i - 1]:
+            total -= volume[i]
+    return total
+
+
+def _obv_last_vectorized(close: np.ndarray, volume: np.ndarray) -> float:
+    """Last On-Balance Volume value from whole-array operations."""
+    if close.size == 0:
+        return np.nan
+    diff = np.diff(close)
+    signed = np.where(diff > 0, volume[1:], np.where(diff < 0, -volume[1:], 0.0))
+    return float(volume[0] + signed.sum())
+
+
+# Without numba the loop would run interpreted, so fall back to the vectorized form
+obv_last = _obv_last_loop if NUMBA_AVAILABLE else _obv_last_vectorized
+
+
+@njit(cache=True)
+def _ewm_loop(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponentially weighted mean matching pandas ``ewm(span=span).mean()``."""
+    decay = 1.0 - 2.0 / (span + 1.0)
+    out = np.empty(values.size)
+    numerator = np.float64(0.0)
+    denominator = np.float64(0.0)
+    for i in range(values.size):
+        numerator = values[i] + decay * numerator
+        denominator = 1.0 + decay * denominator
+        out[i] = numerator / denominator
+    return out
+
+
+@njit(cache=True)
+def _ewm_last_loop(values: np.ndarray, span: int) -> float:
+    """Last value of ``ewm``, carried as scalar state."""
+    decay = 1.0 - 2.0 / (span + 1.0)
+    numerator = np.float64(0.0)
+    denominator = np.float64(0.0)
+    for i in range(values.size):
+        numerator = values[i] + decay * numerator
+        denominator = 1.0 + decay * denominator
+    return numerator / denominator if values.size else np.nan
+
+
+@njit(cache=True)
+def _macd_last_loop(values: np.ndarray, fast: int, slow: int, signal: int) -> Tuple[float, float, float]:
+    """Last MACD (macd, signal, histogram) from fused ``ewm`` recurrences, without intermediate arrays."""
+    fast_decay = 1.0 - 2.0 / (fast + 1.0)
+    slow_decay = 1.0 - 2.0 / (slow + 1.0)
+    signal_decay = 1.0 - 2.0 / (signal + 1.0)
+    fast_num = fast_den = np.float64(0.0)
+    slow_num = slow_den = np.float64(0.0)
+    signal_num = signal_den = np.float64(0.0)
+    macd = np.nan
+    signal_value = np.nan
+    for i in range(values.size):
+        fast_num = values[i] + fast_decay * fast_num
+        fast_den = 1.0 + fast_decay * fast_den
+        slow_num = values[i] + slow_decay * slow_num
+        slow_den = 1.0 + slow_decay * slow_den
+        macd = fast_num / fast_den - slow_num / slow_den
+        signal_num = macd + signal_decay * signal_num
+        signal_den = 1.0 + signal_decay * signal_den
+        signal_value = signal_num / signal_den
+    return macd, signal_value, macd - signal_value
+
+
+def _ewm_lfilter(values: np.ndarray, span: int) -> np.ndarray:
+    """``ewm`` evaluated as a first-order IIR filter with scipy."""
+    decay = 1.0 - 2.0 / (span + 1.0)
+    numerator = lfilter([1.0], [1.0, -decay], np.asarray(values, dtype=np.float64))
+    # Sum of the adjust=True weights, 1 + decay + ... + decay**i, in closed form
+    denominator = (1.0 - decay ** np.arange(1, numerator.size + 1)) / (1.0 - decay)
+    return numerator / denominator
+
+
+def _ewm_last_lfilter(values: np.ndarray, span: int) -> float:
+    """Last value of ``ewm`` from the scipy filter."""
+    return _ewm_lfilter(values, span)[-1] if values.size else np.nan
+
+
+def _macd_last_lfilter(values: np.ndarray, fast: int, slow: int, signal: int) -> Tuple[float, float, float]:
+    """Last MACD (macd, signal, histogram) from the scipy filter."""
+    if values.size == 0:
+        return np.nan, np.nan, np.nan
+    macd = _ewm_lfilter(values, fast) - _ewm_lfilter(values, slow)
+    signal_value = _ewm_lfilter(macd, signal)[-1]
+    return macd[-1], signal_value, macd[-1] - signal_value
+
+
+# Without numba the recurrences would run interpreted, so use scipy's compiled filter when available
+if NUMBA_AVAILABLE or lfilter is None:
+    ewm, ewm_last, macd_last = _ewm_loop, _ewm_last_loop, _macd_last_loop
+else:
+    ewm, ewm_last, macd_last = _ewm_lfilter, _ewm_last_lfilter, _macd_last_lfilter
+
+
+@njit(cache=True)
+def simulate_trades(
+    close: np.ndarray, signals: np.ndarray, capital: float, position_size: float, start: int
+) -> Tuple[float, int, np.ndarray, np.ndarray, np.ndarray]:
+    """Run the all-in/all-out position state machine over precomputed signals.
+    
+    Returns the final cash and share count plus parallel arrays of trade bar
+    indexes, sides (1 = buy, -1 = sell) and share counts.
+    """
+    n = close.size
+    trade_index = np.empty(n, dtype=np.int64)
+    trade_side = np.empty(n, dtype=np.int8)
+    trade_shares = np.empty(n, dtype=np.int64)
+    num_trades = 0
+    shares = 0
+    
+    for i in range(start, n):
+        price = close[i]
+        if signals[i] == 1 and shares == 0:
+            shares = int((capital * position_size) / price)
+            capital -= shares * price
+            trade_index[num_trades] = i
+            trade_side[num_trades] = 1
+            trade_shares[num_trades] = shares
+            num_trades += 1
+        elif signals[i] == -1 and shares > 0:
+            capital += shares * price
+            trade_index[num_trades] = i
+            trade_side[num_trades] = -1
+            trade_shares[num_trades] = shares
+            num_trades += 1
+            shares = 0
+    
+    return capital, shares, trade_index[:num_trades], trade_side[:num_trades], trade_shares[:num_trades]
+
+
+def _warm_up() -> None:
+    """Trigger compilation so the first request doesn't pay for it."""
+    sample = np.zeros(300)
+    sample32 = sample.astype(np.float32)
+    for values in (sample, sample32):
+        sma_last(values, 20)
+        bb_last(values, 20, 2.0)
+        rsi_last(values, 14)
+        ewm(values, 12)
+        ewm_last(values, 12)
+        macd_last(values, 12, 26, 9)
+    atr_last(sample, sample, sample, 14)
+    stoch_last(sample, sample, sample, 14, 3)
+    obv_last(sample, sample)
+    simulate_trades(sample + 1.0, np.zeros(300, dtype=np.int8), 1.0, 0.1, 50)
+
+
+if NUMBA_AVAILABLE:
+    _warm_up()
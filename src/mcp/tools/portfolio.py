@@ -1,7 +1,7 @@
 """Portfolio Management MCP Tool."""
 
 import asyncio
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import yfinance as yf
 import pandas as pd
 import numpy as np
@@ -9,6 +9,23 @@ from datetime import datetime, date, timedelta
 
 from mcp import Tool
 from ..schemas import PortfolioSummary, PortfolioAllocation, RiskLevel
+from ._decorators import mcp_execute
+
+
+def _aligned_returns(historical_data: Dict[str, pd.Series]) -> Tuple[List[str], pd.Index, np.ndarray]:
+    """Align close series on their common dates and return daily returns as a float64 matrix."""
+    symbols = list(historical_data)
+    common_idx = None
+    for series in historical_data.values():
+        common_idx = series.index if common_idx is None else common_idx.intersection(series.index)
+    
+    prices = np.column_stack(
+        [historical_data[symbol].reindex(common_idx).to_numpy(dtype=np.float64) for symbol in symbols]
+    )
+    returns = prices[1:] / prices[:-1] - 1.0
+    valid = ~np.isnan(returns).any(axis=1)
+    
+    return symbols, common_idx[1:][valid], returns[valid]
 
 
 class PortfolioTool(Tool):
@@ -17,27 +34,21 @@ class PortfolioTool(Tool):
     name = "manage_portfolio"
     description = "Manage and optimize investment portfolio with risk management and performance tracking"
     
+    @mcp_execute("Failed to manage portfolio")
     async def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the portfolio management tool."""
-        try:
-            action = params.get("action", "analyze")
-            
-            if action == "analyze":
-                return await self._analyze_portfolio(params)
-            elif action == "optimize":
-                return await self._optimize_portfolio(params)
-            elif action == "rebalance":
-                return await self._rebalance_portfolio(params)
-            elif action == "track_performance":
-                return await self._track_performance(params)
-            else:
-                return {"error": f"Action {action} not supported"}
-                
-        except Exception as e:
-            return {
-                "error": f"Failed to manage portfolio: {str(e)}",
-                "success": False
-            }
+        action = params.get("action", "analyze")
+        
+        if action == "analyze":
+            return await self._analyze_portfolio(params)
+        elif action == "optimize":
+            return await self._optimize_portfolio(params)
+        elif action == "rebalance":
+            return await self._rebalance_portfolio(params)
+        elif action == "track_performance":
+            return await self._track_performance(params)
+        else:
+            return {"error": f"Action {action} not supported"}
     
     async def _analyze_portfolio(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze current portfolio."""
@@ -47,6 +58,8 @@ class PortfolioTool(Tool):
             return {"error": "Portfolio data is required"}
         
         # Calculate portfolio metrics
+        # Allocations carry user-supplied positions, so they are validated; the summary is
+        # built from computed numbers and skips validation and the model_dump() walk
         total_value = 0
         total_cost = 0
         allocations = []
@@ -89,7 +102,7 @@ class PortfolioTool(Tool):
         total_pnl = total_value - total_cost
         total_pnl_percent = (total_pnl / total_cost) * 100 if total_cost > 0 else 0
         
-        portfolio_summary = PortfolioSummary(
+        portfolio_summary = PortfolioSummary.model_construct(
             total_value=total_value,
             total_cost=total_cost,
             total_pnl=total_pnl,
@@ -107,7 +120,10 @@ class PortfolioTool(Tool):
         
         return {
             "success": True,
-            "portfolio_summary": portfolio_summary.model_dump(),
+            "portfolio_summary": {
+                **portfolio_summary.__dict__,
+                "allocations": [allocation.__dict__ for allocation in allocations]
+            },
             "message": "Portfolio analysis completed"
         }
     
@@ -136,15 +152,15 @@ class PortfolioTool(Tool):
             return {"error": "Insufficient data for optimization"}
         
         # Calculate returns and covariance matrix
-        returns_data = pd.DataFrame(historical_data).pct_change().dropna()
-        mean_returns = returns_data.mean()
-        cov_matrix = returns_data.cov()
+        symbols_ok, _, returns = _aligned_returns(historical_data)
+        mean_returns = returns.mean(axis=0)
+        cov_matrix = np.cov(returns, rowvar=False)
         
         # Simple optimization (in real implementation, use scipy.optimize)
         # For now, use equal weight or risk-adjusted weights
         if risk_tolerance == RiskLevel.CONSERVATIVE:
             # Conservative: More weight to lower volatility stocks
-            volatilities = returns_data.std()
+            volatilities = returns.std(axis=0, ddof=1)
             weights = 1 / volatilities
             weights = weights / weights.sum()
         elif risk_tolerance == RiskLevel.AGGRESSIVE:
@@ -152,35 +168,34 @@ class PortfolioTool(Tool):
             weights = mean_returns / mean_returns.sum()
         else:
             # Moderate: Equal weight
-            weights = pd.Series(1/len(symbols), index=symbols)
+            weights = np.full(len(symbols_ok), 1 / len(symbols_ok))
         
         # Create optimized allocations
         optimized_allocations = []
-        for symbol in symbols:
-            if symbol in weights.index:
-                allocation = PortfolioAllocation(
-                    symbol=symbol,
-                    weight=weights[symbol] * 100,
-                    shares=0,  # Would be calculated based on available capital
-                    value=0,  # Would be calculated based on available capital
-                    cost_basis=0,
-                    current_price=0,
-                    unrealized_pnl=0,
-                    unrealized_pnl_percent=0,
-                    beta_contribution=0,
-                    volatility_contribution=0
-                )
-                optimized_allocations.append(allocation)
+        for symbol, weight in zip(symbols_ok, weights, strict=True):
+            allocation = PortfolioAllocation.model_construct(
+                symbol=symbol,
+                weight=float(weight) * 100,
+                shares=0,  # Would be calculated based on available capital
+                value=0,  # Would be calculated based on available capital
+                cost_basis=0,
+                current_price=0,
+                unrealized_pnl=0,
+                unrealized_pnl_percent=0,
+                beta_contribution=0,
+                volatility_contribution=0
+            )
+            optimized_allocations.append(allocation)
         
         # Calculate expected portfolio metrics
-        expected_return = (mean_returns * weights).sum()
-        portfolio_variance = (weights.T @ cov_matrix @ weights)
-        portfolio_volatility = np.sqrt(portfolio_variance)
+        expected_return = float(mean_returns @ weights)
+        portfolio_variance = float(weights @ cov_matrix @ weights)
+        portfolio_volatility = float(np.sqrt(portfolio_variance))
         sharpe_ratio = expected_return / portfolio_volatility if portfolio_volatility > 0 else 0
         
         return {
             "success": True,
-            "optimized_allocations": [alloc.model_dump() for alloc in optimized_allocations],
+            "optimized_allocations": [alloc.__dict__ for alloc in optimized_allocations],
             "expected_metrics": {
                 "expected_return": expected_return,
                 "portfolio_volatility": portfolio_volatility,
@@ -222,36 +237,58 @@ class PortfolioTool(Tool):
         for symbol, target_weight in target_allocations.items():
             target_values[symbol] = total_capital * (target_weight / 100)
         
-        # Calculate rebalancing trades
-        rebalancing_trades = []
+        # Calculate rebalancing trades over the union of symbols in one vectorized pass
+        symbols = list(dict.fromkeys([*current_values, *target_values]))
+        current_vals = np.array([current_values.get(symbol, 0.0) for symbol in symbols], dtype=np.float64)
+        target_vals = np.array([target_values.get(symbol, 0.0) for symbol in symbols], dtype=np.float64)
+        prices = np.array([current_prices.get(symbol, 0.0) for symbol in symbols], dtype=np.float64)
         
-        for symbol in set(current_values.keys()) | set(target_values.keys()):
-            current_value = current_values.get(symbol, 0)
-            target_value = target_values.get(symbol, 0)
-            current_price = current_prices.get(symbol, 0)
-            
-            if current_price > 0:
-                current_shares = current_value / current_price
-                target_shares = target_value / current_price
-                shares_to_trade = target_shares - current_shares
-                
-                if abs(shares_to_trade) > 0.01:  # Minimum trade threshold
-                    trade = {
-                        "symbol": symbol,
-                        "action": "buy" if shares_to_trade > 0 else "sell",
-                        "shares": abs(shares_to_trade),
-                        "value": abs(shares_to_trade * current_price),
-                        "current_price": current_price
-                    }
-                    rebalancing_trades.append(trade)
+        shares_to_trade = np.divide(
+            target_vals - current_vals, prices, out=np.zeros_like(prices), where=prices > 0
+        )
+        trade_mask = np.abs(shares_to_trade) > 0.01  # Minimum trade threshold
+        trade_values = np.abs(shares_to_trade * prices)
+        
+        rebalancing_trades = [
+            {
+                "symbol": symbols[i],
+                "action": "buy" if shares_to_trade[i] > 0 else "sell",
+                "shares": float(abs(shares_to_trade[i])),
+                "value": float(trade_values[i]),
+                "current_price": float(prices[i])
+            }
+            for i in np.flatnonzero(trade_mask)
+        ]
         
         return {
             "success": True,
             "rebalancing_trades": rebalancing_trades,
-            "total_trade_value": sum(trade["value"] for trade in rebalancing_trades),
+            "total_trade_value": float(trade_values[trade_mask].sum()),
             "message": f"Portfolio rebalancing plan generated with {len(rebalancing_trades)} trades"
         }
     
+    def _get_benchmark_values(self, benchmark_symbol: str, dates: List[str]) -> np.ndarray:
+        """Get the benchmark close for each date from one history fetch, or 100 where it is unavailable."""
+        values = np.full(len(dates), 100.0)  # Default value
+        try:
+            days = pd.to_datetime(dates)
+            if days.tz is not None:
+                days = days.tz_localize(None)
+            days = days.normalize()
+            benchmark_hist = yf.Ticker(benchmark_symbol).history(
+                start=days.min(), end=days.max() + timedelta(days=1)
+            )
+            if benchmark_hist.empty:
+                return values
+            index = benchmark_hist.index
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            closes = benchmark_hist['Close'].groupby(index.normalize()).first()
+            found = closes.reindex(days).to_numpy(dtype=np.float64)
+            return np.where(np.isnan(found), values, found)
+        except:
+            return values
+    
     async def _track_performance(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Track portfolio performance over time."""
         portfolio_history = params.get("portfolio_history", [])
@@ -260,61 +297,35 @@ class PortfolioTool(Tool):
         if not portfolio_history:
             return {"error": "Portfolio history is required"}
         
-        # Calculate performance metrics
-        performance_data = []
-        benchmark_data = []
+        # Portfolio values as an array, and benchmark values for comparison from a single fetch
+        portfolio_values = np.array([entry["value"] for entry in portfolio_history], dtype=np.float64)
+        benchmark_values = await asyncio.to_thread(
+            self._get_benchmark_values, benchmark_symbol, [entry["date"] for entry in portfolio_history]
+        )
         
-        for entry in portfolio_history:
-            date = entry["date"]
-            portfolio_value = entry["value"]
-            
-            # Get benchmark value for comparison
-            try:
-                benchmark = yf.Ticker(benchmark_symbol)
-                benchmark_hist = benchmark.history(start=date, end=date, period="1d")
-                if not benchmark_hist.empty:
-                    benchmark_value = benchmark_hist['Close'].iloc[0]
-                else:
-                    benchmark_value = 100  # Default value
-            except:
-                benchmark_value = 100
-            
-            performance_data.append({
-                "date": date,
-                "portfolio_value": portfolio_value,
-                "benchmark_value": benchmark_value
-            })
+        performance_data = [
+            {
+                "date": entry["date"],
+                "portfolio_value": entry["value"],
+                "benchmark_value": float(benchmark_value)
+            }
+            for entry, benchmark_value in zip(portfolio_history, benchmark_values, strict=True)
+        ]
         
         # Calculate performance metrics
-        if len(performance_data) > 1:
-            initial_portfolio = performance_data[0]["portfolio_value"]
-            final_portfolio = performance_data[-1]["portfolio_value"]
-            initial_benchmark = performance_data[0]["benchmark_value"]
-            final_benchmark = performance_data[-1]["benchmark_value"]
-            
-            portfolio_return = (final_portfolio / initial_portfolio - 1) * 100
-            benchmark_return = (final_benchmark / initial_benchmark - 1) * 100
+        if len(portfolio_values) > 1:
+            portfolio_return = float((portfolio_values[-1] / portfolio_values[0] - 1) * 100)
+            benchmark_return = float((benchmark_values[-1] / benchmark_values[0] - 1) * 100)
             excess_return = portfolio_return - benchmark_return
             
             # Calculate volatility
-            portfolio_returns = []
-            for i in range(1, len(performance_data)):
-                ret = (performance_data[i]["portfolio_value"] / performance_data[i-1]["portfolio_value"] - 1)
-                portfolio_returns.append(ret)
-            
-            volatility = np.std(portfolio_returns) * np.sqrt(252) * 100  # Annualized
+            portfolio_returns = portfolio_values[1:] / portfolio_values[:-1] - 1
+            volatility = float(np.std(portfolio_returns) * np.sqrt(252) * 100)  # Annualized
             sharpe_ratio = portfolio_return / volatility if volatility > 0 else 0
             
-            # Calculate maximum drawdown
-            peak = initial_portfolio
-            max_drawdown = 0
-            
-            for entry in performance_data:
-                value = entry["portfolio_value"]
-                if value > peak:
-                    peak = value
-                drawdown = (peak - value) / peak * 100
-                max_drawdown = max(max_drawdown, drawdown)
+            # Calculate maximum drawdown against the running peak
+            peaks = np.maximum.accumulate(portfolio_values)
+            max_drawdown = float(max(0, np.max((peaks - portfolio_values) / peaks * 100)))
             
         else:
             portfolio_return = 0
@@ -345,74 +356,69 @@ class RiskAnalysisTool(Tool):
     name = "analyze_risk"
     description = "Analyze portfolio risk metrics including VaR, CVaR, and stress testing"
     
+    @mcp_execute("Failed to analyze risk")
     async def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the risk analysis tool."""
-        try:
-            portfolio_data = params.get("portfolio", [])
-            confidence_level = params.get("confidence_level", 0.95)
-            
-            if not portfolio_data:
-                return {"error": "Portfolio data is required"}
-            
-            # Get historical data for risk analysis
-            symbols = [position["symbol"] for position in portfolio_data]
-            historical_data = {}
-            
-            for symbol in symbols:
-                try:
-                    stock = yf.Ticker(symbol)
-                    hist = stock.history(period="1y")
-                    if not hist.empty:
-                        historical_data[symbol] = hist['Close']
-                except:
-                    continue
-            
-            if len(historical_data) < 2:
-                return {"error": "Insufficient data for risk analysis"}
-            
-            # Calculate returns
-            returns_data = pd.DataFrame(historical_data).pct_change().dropna()
-            
-            # Calculate portfolio weights (simplified - equal weight)
-            weights = pd.Series(1/len(symbols), index=symbols)
-            
-            # Calculate portfolio returns
-            portfolio_returns = (returns_data * weights).sum(axis=1)
-            
-            # Calculate risk metrics
-            portfolio_volatility = portfolio_returns.std() * np.sqrt(252)
-            var_95 = np.percentile(portfolio_returns, (1 - confidence_level) * 100)
-            cvar_95 = portfolio_returns[portfolio_returns <= var_95].mean()
-            
-            # Calculate beta (simplified)
+        portfolio_data = params.get("portfolio", [])
+        confidence_level = params.get("confidence_level", 0.95)
+        
+        if not portfolio_data:
+            return {"error": "Portfolio data is required"}
+        
+        # Get historical data for risk analysis
+        symbols = [position["symbol"] for position in portfolio_data]
+        historical_data = {}
+        
+        for symbol in symbols:
             try:
-                spy = yf.Ticker("SPY")
-                spy_hist = spy.history(period="1y")
-                spy_returns = spy_hist['Close'].pct_change().dropna()
-                
-                # Align data
-                common_dates = portfolio_returns.index.intersection(spy_returns.index)
-                portfolio_returns_aligned = portfolio_returns[common_dates]
-                spy_returns_aligned = spy_returns[common_dates]
-                
-                beta = np.cov(portfolio_returns_aligned, spy_returns_aligned)[0, 1] / np.var(spy_returns_aligned)
+                stock = yf.Ticker(symbol)
+                hist = stock.history(period="1y")
+                if not hist.empty:
+                    historical_data[symbol] = hist['Close']
             except:
-                beta = 1.0  # Default beta
+                continue
+        
+        if len(historical_data) < 2:
+            return {"error": "Insufficient data for risk analysis"}
+        
+        # Calculate returns
+        _, dates, returns = _aligned_returns(historical_data)
+        
+        # Calculate portfolio weights (simplified - equal weight)
+        weights = np.full(returns.shape[1], 1 / len(symbols))
+        
+        # Calculate portfolio returns
+        portfolio_returns = returns @ weights
+        
+        # Calculate risk metrics
+        portfolio_volatility = float(portfolio_returns.std(ddof=1) * np.sqrt(252))
+        var_95 = float(np.percentile(portfolio_returns, (1 - confidence_level) * 100))
+        cvar_95 = float(portfolio_returns[portfolio_returns <= var_95].mean())
+        
+        # Calculate beta (simplified)
+        try:
+            spy = yf.Ticker("SPY")
+            spy_hist = spy.history(period="1y")
+            spy_returns = spy_hist['Close'].pct_change().dropna()
             
-            return {
-                "success": True,
-                "risk_metrics": {
-                    "portfolio_volatility": portfolio_volatility,
-                    "var_95": var_95,
-                    "cvar_95": cvar_95,
-                    "beta": beta,
-                    "confidence_level": confidence_level
-                },
-                "message": "Risk analysis completed"
-            }
+            # Align data
+            spy_returns_aligned = spy_returns.reindex(dates).to_numpy()
+            common = ~np.isnan(spy_returns_aligned)
+            portfolio_returns_aligned = portfolio_returns[common]
+            spy_returns_aligned = spy_returns_aligned[common]
             
-        except Exception as e:
-            return {
-                "error": f"Failed to analyze risk: {str(e)}",
-                "success": False
-            }
+            beta = float(np.cov(portfolio_returns_aligned, spy_returns_aligned)[0, 1] / np.var(spy_returns_aligned))
+        except:
+            beta = 1.0  # Default beta
+        
+        return {
+            "success": True,
+            "risk_metrics": {
+                "portfolio_volatility": portfolio_volatility,
+                "var_95": var_95,
+                "cvar_95": cvar_95,
+                "beta": beta,
+                "confidence_level": confidence_level
+            },
+            "message": "Risk analysis completed"
+        }
@@ -1,14 +1,136 @@
 """Trading Signals MCP Tool."""
 
 import asyncio
-from typing import Dict, Any, Optional, List
-import yfinance as yf
+import sys
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 import pandas as pd
 import numpy as np
+from dataclasses import dataclass
 from datetime import datetime, date, timedelta
 
 from mcp import Tool
 from ..schemas import TradingSignal, SignalType, RiskLevel
+from ._cache import cached_history
+from ._kernels import atr_last, bb_last, macd_last, rsi_last, simulate_trades, sma_full, sma_last, trend_signals
+from ._decorators import mcp_execute
+
+
+@dataclass(slots=True, frozen=True)
+class TAResult:
+    """Latest indicator values used to generate a trading signal."""
+    current_price: float
+    sma_20: float
+    sma_50: float
+    sma_200: float
+    rsi: float
+    macd: float
+    macd_signal: float
+    macd_histogram: float
+    bb_upper: float
+    bb_middle: float
+    bb_lower: float
+    atr: float
+    trend_direction: str
+    price_position: float
+    # Last close at the float32 precision the price-level indicators were computed in,
+    # so comparisons against them aren't skewed by rounding
+    indicator_price: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the technical analysis dictionary returned by the tool."""
+        return {
+            "current_price": self.current_price,
+            "sma_20": self.sma_20,
+            "sma_50": self.sma_50,
+            "sma_200": self.sma_200,
+            "rsi": self.rsi,
+            "macd": {
+                "macd": self.macd,
+                "signal": self.macd_signal,
+                "histogram": self.macd_histogram
+            },
+            "bollinger_bands": {
+                "upper": self.bb_upper,
+                "middle": self.bb_middle,
+                "lower": self.bb_lower
+            },
+            "atr": self.atr,
+            "trend_direction": self.trend_direction,
+            "price_position": self.price_position
+        }
+
+
+# Condition bits for trend following signals, in the order they are evaluated
+(
+    _TREND_UP, _TREND_DOWN,
+    _ABOVE_SMA20, _BELOW_SMA20, _ABOVE_SMA50, _BELOW_SMA50,
+    _SMA20_ABOVE_SMA50, _SMA20_BELOW_SMA50, _SMA50_ABOVE_SMA200, _SMA50_BELOW_SMA200,
+    _RSI_BELOW_70, _RSI_BELOW_75, _RSI_ABOVE_30, _RSI_ABOVE_25,
+    _MACD_BULLISH, _MACD_BEARISH,
+    _BELOW_UPPER_BAND, _ABOVE_LOWER_BAND,
+) = (1 << bit for bit in range(18))
+
+# Reasons reported with each signal type, interned once at import
+_REASONS = {
+    signal_type: tuple(sys.intern(reason) for reason in reasons)
+    for signal_type, reasons in {
+        SignalType.STRONG_BUY: (
+            "Strong uptrend confirmed by moving averages",
+            "RSI indicates momentum without overbought conditions",
+            "MACD shows bullish momentum",
+            "Price not at resistance level"
+        ),
+        SignalType.BUY: (
+            "Uptrend confirmed",
+            "RSI in healthy range",
+            "MACD bullish"
+        ),
+        SignalType.STRONG_SELL: (
+            "Strong downtrend confirmed by moving averages",
+            "RSI indicates momentum without oversold conditions",
+            "MACD shows bearish momentum",
+            "Price not at support level"
+        ),
+        SignalType.SELL: (
+            "Downtrend confirmed",
+            "RSI in bearish range",
+            "MACD bearish"
+        ),
+        SignalType.HOLD: (
+            "Mixed signals - waiting for clearer trend confirmation",
+        ),
+    }.items()
+}
+
+# (required condition bits, signal type, confidence) checked in priority order
+_SIGNAL_RULES = (
+    (
+        _TREND_UP | _ABOVE_SMA20 | _SMA20_ABOVE_SMA50 | _SMA50_ABOVE_SMA200
+        | _RSI_BELOW_70 | _MACD_BULLISH | _BELOW_UPPER_BAND,
+        SignalType.STRONG_BUY, 85.0
+    ),
+    (_TREND_UP | _ABOVE_SMA50 | _RSI_BELOW_75 | _MACD_BULLISH, SignalType.BUY, 70.0),
+    (
+        _TREND_DOWN | _BELOW_SMA20 | _SMA20_BELOW_SMA50 | _SMA50_BELOW_SMA200
+        | _RSI_ABOVE_30 | _MACD_BEARISH | _ABOVE_LOWER_BAND,
+        SignalType.STRONG_SELL, 85.0
+    ),
+    (_TREND_DOWN | _BELOW_SMA50 | _RSI_ABOVE_25 | _MACD_BEARISH, SignalType.SELL, 70.0),
+    (0, SignalType.HOLD, 60.0),
+)
+
+
+_BUY_SIGNALS = frozenset({SignalType.BUY, SignalType.STRONG_BUY})
+_SELL_SIGNALS = frozenset({SignalType.SELL, SignalType.STRONG_SELL})
+
+# Per risk level: conservative trades less confidently with wider stops, aggressive the opposite
+_CONFIDENCE_MULTIPLIERS = {RiskLevel.CONSERVATIVE: 0.8, RiskLevel.MODERATE: 1.0, RiskLevel.AGGRESSIVE: 1.2}
+_STOP_LOSS_MULTIPLIERS = {RiskLevel.CONSERVATIVE: 2.0, RiskLevel.MODERATE: 1.5, RiskLevel.AGGRESSIVE: 1.0}
+
+# Latest analysis per (symbol, last bar, bar count, last close), least recently used first
+TA_CACHE_SIZE = 1024
+_ta_cache: "OrderedDict[Tuple[Any, ...], TAResult]" = OrderedDict()
 
 
 class TradingSignalTool(Tool):
@@ -17,223 +139,167 @@ class TradingSignalTool(Tool):
     name = "generate_signal"
     description = "Generate trading signals based on trend following analysis and risk management"
     
+    @mcp_execute("Failed to generate trading signal")
     async def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the trading signal tool."""
-        try:
-            symbol = params.get("symbol", "").upper()
-            strategy = params.get("strategy", "trend_following")
-            risk_level = params.get("risk_level", RiskLevel.MODERATE)
-            position_size = params.get("position_size", 0.1)  # 10% default
-            
-            if not symbol:
-                return {"error": "Symbol is required"}
-            
-            # Get stock data and technical analysis
-            stock = yf.Ticker(symbol)
-            hist = stock.history(period="1y")
-            
-            if hist.empty:
-                return {"error": f"No data found for symbol {symbol}"}
-            
-            # Get current price
-            current_price = hist['Close'].iloc[-1]
-            
-            # Perform technical analysis
-            technical_analysis = await self._perform_technical_analysis(hist)
-            
-            # Generate signal based on strategy
-            if strategy == "trend_following":
-                signal = await self._generate_trend_following_signal(
-                    symbol, current_price, technical_analysis, risk_level
-                )
-            else:
-                return {"error": f"Strategy {strategy} not implemented"}
-            
-            # Calculate position sizing and risk management
-            signal = await self._add_risk_management(signal, current_price, technical_analysis, risk_level, position_size)
-            
-            return {
-                "success": True,
-                "signal": signal.model_dump(),
-                "analysis": technical_analysis,
-                "message": f"Trading signal generated for {symbol}"
-            }
-            
-        except Exception as e:
-            return {
-                "error": f"Failed to generate trading signal: {str(e)}",
-                "success": False
-            }
-    
-    async def _perform_technical_analysis(self, hist: pd.DataFrame) -> Dict[str, Any]:
-        """Perform comprehensive technical analysis."""
-        current_price = hist['Close'].iloc[-1]
+        symbol = params.get("symbol", "").upper()
+        strategy = params.get("strategy", "trend_following")
+        risk_level = params.get("risk_level", RiskLevel.MODERATE)
+        position_size = params.get("position_size", 0.1)  # 10% default
         
-        # Calculate moving averages
-        sma_20 = hist['Close'].rolling(window=20).mean().iloc[-1]
-        sma_50 = hist['Close'].rolling(window=50).mean().iloc[-1]
-        sma_200 = hist['Close'].rolling(window=200).mean().iloc[-1]
+        if not symbol:
+            return {"error": "Symbol is required"}
         
-        # Calculate RSI
-        rsi = self._calculate_rsi(hist['Close'])
+        if strategy != "trend_following":
+            return {"error": f"Strategy {strategy} not implemented"}
         
-        # Calculate MACD
-        macd_data = self._calculate_macd(hist['Close'])
+        # Get stock data and technical analysis
+        hist = await asyncio.to_thread(cached_history, symbol, period="1y")
         
-        # Calculate Bollinger Bands
-        bb_data = self._calculate_bollinger_bands(hist['Close'])
+        if hist.empty:
+            return {"error": f"No data found for symbol {symbol}"}
         
-        # Calculate ATR for volatility
-        atr = self._calculate_atr(hist)
-        
-        # Determine trend
-        trend_direction = "up" if current_price > sma_50 > sma_200 else "down" if current_price < sma_50 < sma_200 else "sideways"
+        # Perform technical analysis and generate the signal with its risk management
+        technical_analysis = self._cached_technical_analysis(symbol, hist)
+        signal = self._build_signal(symbol, technical_analysis, risk_level, position_size)
         
         return {
-            "current_price": current_price,
-            "sma_20": sma_20,
-            "sma_50": sma_50,
-            "sma_200": sma_200,
-            "rsi": rsi,
-            "macd": macd_data,
-            "bollinger_bands": bb_data,
-            "atr": atr,
-            "trend_direction": trend_direction,
-            "price_position": (current_price - bb_data["lower"]) / (bb_data["upper"] - bb_data["lower"])
+            "success": True,
+            "signal": signal.model_dump(),
+            "analysis": signal.technical_analysis,
+            "message": f"Trading signal generated for {symbol}"
         }
     
-    async def _generate_trend_following_signal(
-        self, 
-        symbol: str, 
-        current_price: float, 
-        analysis: Dict[str, Any], 
-        risk_level: RiskLevel
-    ) -> TradingSignal:
-        """Generate trend following trading signal."""
-        
-        # Initialize signal components
-        signal_type = SignalType.HOLD
-        confidence = 50.0
-        reasons = []
-        
-        # Trend analysis
-        trend_direction = analysis["trend_direction"]
-        sma_20 = analysis["sma_20"]
-        sma_50 = analysis["sma_50"]
-        sma_200 = analysis["sma_200"]
-        rsi = analysis["rsi"]
-        macd = analysis["macd"]
-        bb_data = analysis["bollinger_bands"]
-        price_position = analysis["price_position"]
-        
-        # Strong buy conditions
-        if (trend_direction == "up" and 
-            current_price > sma_20 > sma_50 > sma_200 and
-            rsi < 70 and  # Not overbought
-            macd["macd"] > macd["signal"] and
-            price_position < 0.8):  # Not at upper Bollinger Band
-            
-            signal_type = SignalType.STRONG_BUY
-            confidence = 85.0
-            reasons.extend([
-                "Strong uptrend confirmed by moving averages",
-                "RSI indicates momentum without overbought conditions",
-                "MACD shows bullish momentum",
-                "Price not at resistance level"
-            ])
+    async def execute_batch(self, symbols: List[str], **params: Any) -> Dict[str, Any]:
+        """Generate trading signals for several symbols concurrently, reporting failures per symbol."""
+        # Upper-case and drop repeats so each symbol is fetched and reported once
+        symbols = list(dict.fromkeys(str(symbol).upper() for symbol in symbols))
+        
+        # Fetch every history in parallel threads so the per-symbol runs hit the cache
+        await asyncio.gather(
+            *(asyncio.to_thread(cached_history, symbol, period="1y") for symbol in symbols),
+            return_exceptions=True
+        )
         
-        # Buy conditions
-        elif (trend_direction == "up" and
-              current_price > sma_50 and
-              rsi < 75 and
-              macd["macd"] > macd["signal"]):
-            
-            signal_type = SignalType.BUY
-            confidence = 70.0
-            reasons.extend([
-                "Uptrend confirmed",
-                "RSI in healthy range",
-                "MACD bullish"
-            ])
+        # execute() turns its own exceptions into an error response, so a bad symbol fails alone
+        results = await asyncio.gather(
+            *(self.execute({**params, "symbol": symbol}) for symbol in symbols)
+        )
+        return {
+            "success": True,
+            "results": dict(zip(symbols, results, strict=True)),
+            "message": f"Trading signals generated for {len(symbols)} symbols"
+        }
+    
+    def _cached_technical_analysis(self, symbol: str, hist: pd.DataFrame) -> TAResult:
+        """Reuse the analysis until the history gains a bar or the latest bar's close changes."""
+        key = (symbol, hist.index[-1], len(hist), float(hist['Close'].to_numpy()[-1]))
+        analysis = _ta_cache.get(key)
+        if analysis is None:
+            analysis = _ta_cache[key] = self._perform_technical_analysis(hist)
+            if len(_ta_cache) > TA_CACHE_SIZE:
+                _ta_cache.popitem(last=False)
+        else:
+            _ta_cache.move_to_end(key)
+        return analysis
+    
+    def _perform_technical_analysis(self, hist: pd.DataFrame) -> TAResult:
+        """Perform comprehensive technical analysis."""
+        # Pull the price columns out once as contiguous rows; every indicator only needs its last value
+        high, low, close = hist[['High', 'Low', 'Close']].to_numpy(dtype=np.float64).T
+        current_price = close[-1]
         
-        # Strong sell conditions
-        elif (trend_direction == "down" and
-              current_price < sma_20 < sma_50 < sma_200 and
-              rsi > 30 and  # Not oversold
-              macd["macd"] < macd["signal"] and
-              price_position > 0.2):  # Not at lower Bollinger Band
-            
-            signal_type = SignalType.STRONG_SELL
-            confidence = 85.0
-            reasons.extend([
-                "Strong downtrend confirmed by moving averages",
-                "RSI indicates momentum without oversold conditions",
-                "MACD shows bearish momentum",
-                "Price not at support level"
-            ])
+        # Float32 is plenty for price-level indicators and halves the data the kernels stream;
+        # the price they are compared with must be rounded the same way
+        close32 = close.astype(np.float32)
+        indicator_price = float(close32[-1])
         
-        # Sell conditions
-        elif (trend_direction == "down" and
-              current_price < sma_50 and
-              rsi > 25 and
-              macd["macd"] < macd["signal"]):
-            
-            signal_type = SignalType.SELL
-            confidence = 70.0
-            reasons.extend([
-                "Downtrend confirmed",
-                "RSI in bearish range",
-                "MACD bearish"
-            ])
+        # Calculate moving averages
+        sma_20 = sma_last(close32, 20)
+        sma_50 = sma_last(close32, 50)
+        sma_200 = sma_last(close32, 200)
         
-        # Hold conditions
-        else:
-            signal_type = SignalType.HOLD
-            confidence = 60.0
-            reasons.append("Mixed signals - waiting for clearer trend confirmation")
+        # Calculate RSI, MACD and Bollinger Bands
+        rsi = rsi_last(close32, 14)
+        macd, macd_signal, macd_histogram = macd_last(close32, 12, 26, 9)
+        bb_upper, bb_middle, bb_lower = bb_last(close32, 20, 2.0)
         
-        # Adjust confidence based on risk level
-        if risk_level == RiskLevel.CONSERVATIVE:
-            confidence *= 0.8  # More conservative
-        elif risk_level == RiskLevel.AGGRESSIVE:
-            confidence *= 1.2  # More aggressive
+        # Calculate ATR for volatility; stays in float64 since stop losses are set from it
+        atr = atr_last(high, low, close, 14)
         
-        return TradingSignal(
-            symbol=symbol,
-            signal_type=signal_type,
-            confidence=min(100, confidence),
-            price=current_price,
-            reasons=reasons,
-            technical_analysis=analysis
+        # Determine trend
+        trend_direction = "up" if indicator_price > sma_50 > sma_200 else "down" if indicator_price < sma_50 < sma_200 else "sideways"
+        
+        return TAResult(
+            current_price=current_price,
+            sma_20=sma_20,
+            sma_50=sma_50,
+            sma_200=sma_200,
+            rsi=rsi,
+            macd=macd,
+            macd_signal=macd_signal,
+            macd_histogram=macd_histogram,
+            bb_upper=bb_upper,
+            bb_middle=bb_middle,
+            bb_lower=bb_lower,
+            atr=atr,
+            trend_direction=trend_direction,
+            price_position=(indicator_price - bb_lower) / (bb_upper - bb_lower) if bb_upper > bb_lower else np.nan,
+            indicator_price=indicator_price
         )
     
-    async def _add_risk_management(
+    def _build_signal(
         self, 
-        signal: TradingSignal, 
-        current_price: float, 
-        analysis: Dict[str, Any], 
+        symbol: str, 
+        analysis: TAResult, 
         risk_level: RiskLevel,
         position_size: float
     ) -> TradingSignal:
-        """Add risk management parameters to the signal."""
+        """Generate a trend following trading signal with its risk management parameters."""
+        current_price = analysis.current_price
+        indicator_price = analysis.indicator_price
+        
+        # Evaluate every condition once into a bitmask
+        conditions = (
+            analysis.trend_direction == "up",
+            analysis.trend_direction == "down",
+            indicator_price > analysis.sma_20,
+            indicator_price < analysis.sma_20,
+            indicator_price > analysis.sma_50,
+            indicator_price < analysis.sma_50,
+            analysis.sma_20 > analysis.sma_50,
+            analysis.sma_20 < analysis.sma_50,
+            analysis.sma_50 > analysis.sma_200,
+            analysis.sma_50 < analysis.sma_200,
+            analysis.rsi < 70,
+            analysis.rsi < 75,
+            analysis.rsi > 30,
+            analysis.rsi > 25,
+            analysis.macd > analysis.macd_signal,
+            analysis.macd < analysis.macd_signal,
+            analysis.price_position < 0.8,
+            analysis.price_position > 0.2,
+        )
+        mask = 0
+        for bit, condition in enumerate(conditions):
+            mask |= bool(condition) << bit
         
-        atr = analysis["atr"]
-        bb_data = analysis["bollinger_bands"]
+        # First rule whose required conditions all hold wins
+        for required, signal_type, confidence in _SIGNAL_RULES:
+            if mask & required == required:
+                break
         
-        # Calculate stop loss based on ATR and risk level
-        if risk_level == RiskLevel.CONSERVATIVE:
-            stop_loss_multiplier = 2.0
-        elif risk_level == RiskLevel.MODERATE:
-            stop_loss_multiplier = 1.5
-        else:  # AGGRESSIVE
-            stop_loss_multiplier = 1.0
+        # Adjust confidence and stop loss distance based on risk level
+        confidence = min(100, confidence * _CONFIDENCE_MULTIPLIERS.get(risk_level, 1.0))
+        stop_loss_multiplier = _STOP_LOSS_MULTIPLIERS.get(risk_level, 1.0)
         
         # Set stop loss and take profit
-        if signal.signal_type in [SignalType.BUY, SignalType.STRONG_BUY]:
+        atr = analysis.atr
+        if signal_type in _BUY_SIGNALS:
             stop_loss = current_price - (atr * stop_loss_multiplier)
             take_profit = current_price + (atr * stop_loss_multiplier * 2)  # 2:1 risk/reward
             target_price = current_price + (atr * stop_loss_multiplier * 1.5)
-        elif signal.signal_type in [SignalType.SELL, SignalType.STRONG_SELL]:
+        elif signal_type in _SELL_SIGNALS:
             stop_loss = current_price + (atr * stop_loss_multiplier)
             take_profit = current_price - (atr * stop_loss_multiplier * 2)
             target_price = current_price - (atr * stop_loss_multiplier * 1.5)
@@ -250,64 +316,20 @@ class TradingSignalTool(Tool):
         else:
             risk_reward_ratio = None
         
-        # Adjust position size based on confidence and risk level
-        adjusted_position_size = position_size * (signal.confidence / 100)
-        
-        # Update signal with risk management parameters
-        signal.stop_loss = stop_loss
-        signal.take_profit = take_profit
-        signal.target_price = target_price
-        signal.risk_reward_ratio = risk_reward_ratio
-        signal.position_size = adjusted_position_size
-        
-        return signal
-    
-    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> float:
-        """Calculate RSI."""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.iloc[-1]
-    
-    def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, float]:
-        """Calculate MACD."""
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal).mean()
-        histogram = macd_line - signal_line
-        
-        return {
-            "macd": macd_line.iloc[-1],
-            "signal": signal_line.iloc[-1],
-            "histogram": histogram.iloc[-1]
-        }
-    
-    def _calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std_dev: int = 2) -> Dict[str, float]:
-        """Calculate Bollinger Bands."""
-        middle = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
-        upper = middle + (std * std_dev)
-        lower = middle - (std * std_dev)
-        
-        return {
-            "upper": upper.iloc[-1],
-            "middle": middle.iloc[-1],
-            "lower": lower.iloc[-1]
-        }
-    
-    def _calculate_atr(self, hist: pd.DataFrame, period: int = 14) -> float:
-        """Calculate Average True Range."""
-        high_low = hist['High'] - hist['Low']
-        high_close = np.abs(hist['High'] - hist['Close'].shift())
-        low_close = np.abs(hist['Low'] - hist['Close'].shift())
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = true_range.rolling(window=period).mean()
-        
-        return atr.iloc[-1]
+        return TradingSignal(
+            symbol=symbol,
+            signal_type=signal_type,
+            confidence=confidence,
+            price=current_price,
+            target_price=target_price,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            reasons=list(_REASONS[signal_type]),
+            technical_analysis=analysis.to_dict(),
+            risk_reward_ratio=risk_reward_ratio,
+            # Adjust position size based on confidence and risk level
+            position_size=position_size * (confidence / 100)
+        )
 
 
 class SignalBacktestTool(Tool):
@@ -316,79 +338,63 @@ class SignalBacktestTool(Tool):
     name = "backtest_signals"
     description = "Backtest trading signals to evaluate strategy performance"
     
+    @mcp_execute("Failed to run backtest")
     async def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the signal backtest tool."""
-        try:
-            symbol = params.get("symbol", "").upper()
-            start_date = params.get("start_date", "2023-01-01")
-            end_date = params.get("end_date", "2024-01-01")
-            initial_capital = params.get("initial_capital", 100000)
-            position_size = params.get("position_size", 0.1)
-            
-            if not symbol:
-                return {"error": "Symbol is required"}
-            
-            # Get historical data
-            stock = yf.Ticker(symbol)
-            hist = stock.history(start=start_date, end=end_date)
-            
-            if hist.empty:
-                return {"error": f"No data found for symbol {symbol}"}
-            
-            # Run backtest
-            backtest_results = await self._run_backtest(hist, initial_capital, position_size)
-            
-            return {
-                "success": True,
-                "backtest_results": backtest_results,
-                "message": f"Backtest completed for {symbol}"
-            }
-            
-        except Exception as e:
-            return {
-                "error": f"Failed to run backtest: {str(e)}",
-                "success": False
-            }
+        symbol = params.get("symbol", "").upper()
+        start_date = params.get("start_date", "2023-01-01")
+        end_date = params.get("end_date", "2024-01-01")
+        initial_capital = params.get("initial_capital", 100000)
+        position_size = params.get("position_size", 0.1)
+        
+        if not symbol:
+            return {"error": "Symbol is required"}
+        
+        # Get historical data
+        hist = await asyncio.to_thread(cached_history, symbol, start=start_date, end=end_date)
+        
+        if hist.empty:
+            return {"error": f"No data found for symbol {symbol}"}
+        
+        # Run backtest
+        backtest_results = self._run_backtest(hist, initial_capital, position_size)
+        
+        return {
+            "success": True,
+            "backtest_results": backtest_results,
+            "message": f"Backtest completed for {symbol}"
+        }
     
-    async def _run_backtest(self, hist: pd.DataFrame, initial_capital: float, position_size: float) -> Dict[str, Any]:
+    def _run_backtest(self, hist: pd.DataFrame, initial_capital: float, position_size: float) -> Dict[str, Any]:
         """Run backtest simulation."""
         # This is a simplified backtest implementation
         # In a real implementation, you would use more sophisticated backtesting
+        close = hist['Close'].to_numpy(dtype=np.float64)
         
-        capital = initial_capital
-        shares = 0
-        trades = []
+        # Signal for every day at once: 1 = buy, -1 = sell, 0 = hold
+        close32 = close.astype(np.float32)
+        sma_20 = sma_full(close32, 20)
+        sma_50 = sma_full(close32, 50)
+        signals = trend_signals(close32, sma_20, sma_50)
         
-        for i in range(50, len(hist)):  # Start after 50 days for moving averages
-            current_data = hist.iloc[:i+1]
-            current_price = current_data['Close'].iloc[-1]
-            
-            # Generate signal for this point
-            signal = await self._generate_historical_signal(current_data)
-            
-            # Execute trades based on signal
-            if signal == "buy" and shares == 0:
-                shares = int((capital * position_size) / current_price)
-                capital -= shares * current_price
-                trades.append({
-                    "date": current_data.index[-1],
-                    "action": "buy",
-                    "price": current_price,
-                    "shares": shares
-                })
-            
-            elif signal == "sell" and shares > 0:
-                capital += shares * current_price
-                trades.append({
-                    "date": current_data.index[-1],
-                    "action": "sell",
-                    "price": current_price,
-                    "shares": shares
-                })
-                shares = 0
+        # Start after 50 days for moving averages
+        capital, shares, trade_index, trade_side, trade_shares = simulate_trades(
+            close, signals, float(initial_capital), float(position_size), 50
+        )
+        
+        dates = hist.index
+        trades = [
+            {
+                "date": dates[i],
+                "action": "buy" if side > 0 else "sell",
+                "price": close[i],
+                "shares": int(n_shares)
+            }
+            for i, side, n_shares in zip(trade_index, trade_side, trade_shares, strict=True)
+        ]
         
         # Calculate final portfolio value
-        final_value = capital + (shares * hist['Close'].iloc[-1])
+        final_value = capital + (shares * close[-1])
         total_return = (final_value - initial_capital) / initial_capital * 100
         
         return {
@@ -398,17 +404,3 @@ class SignalBacktestTool(Tool):
             "total_trades": len(trades),
             "trades": trades
         }
-    
-    async def _generate_historical_signal(self, hist: pd.DataFrame) -> str:
-        """Generate signal for historical data point."""
-        # Simplified signal generation for backtesting
-        current_price = hist['Close'].iloc[-1]
-        sma_20 = hist['Close'].rolling(window=20).mean().iloc[-1]
-        sma_50 = hist['Close'].rolling(window=50).mean().iloc[-1]
-        
-        if current_price > sma_20 > sma_50:
-            return "buy"
-        elif current_price < sma_20 < sma_50:
-            return "sell"
-        else:
-            return "hold"
@@ -4,10 +4,28 @@ import asyncio
 from typing import Dict, Any, Optional, List
 import yfinance as yf
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 
 from mcp import Tool
 from ..schemas import StockInfo
+from ._cache import QUOTE_TTL, cached_fast_info, cached_history, cached_info, get_ticker
+from ._decorators import mcp_execute
+
+
+def _first_present(*values: Any) -> Any:
+    """Return the first value that is not None or NaN."""
+    for value in values:
+        if value is not None and not pd.isna(value):
+            return value
+    return None
+
+
+def _latest_values(statement: pd.DataFrame) -> Dict[str, Any]:
+    """Map a financial statement's row labels to their most recent period's value."""
+    if statement.empty:
+        return {}
+    return dict(zip(statement.index, statement.iloc[:, 0].tolist(), strict=True))
 
 
 class StockInfoTool(Tool):
@@ -16,76 +34,95 @@ class StockInfoTool(Tool):
     name = "get_stock_info"
     description = "Get comprehensive stock information including price, financials, and company details"
     
+    @mcp_execute("Failed to get stock info")
     async def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the stock info tool."""
-        try:
-            symbol = params.get("symbol", "").upper()
-            include_financials = params.get("include_financials", False)
-            include_news = params.get("include_news", False)
-            
-            if not symbol:
-                return {"error": "Symbol is required"}
-            
-            # Get stock info using yfinance
-            stock = yf.Ticker(symbol)
-            
-            # Get basic info
-            info = stock.info
-            
-            # Get current price data
-            hist = stock.history(period="5d")
-            if hist.empty:
-                return {"error": f"No data found for symbol {symbol}"}
-            
-            current_price = hist['Close'].iloc[-1]
-            prev_price = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-            change = current_price - prev_price
-            change_percent = (change / prev_price) * 100 if prev_price != 0 else 0
-            
-            # Build stock info
-            stock_info = StockInfo(
-                symbol=symbol,
-                name=info.get('longName', info.get('shortName', symbol)),
-                sector=info.get('sector'),
-                industry=info.get('industry'),
-                market_cap=info.get('marketCap'),
-                pe_ratio=info.get('trailingPE'),
-                price=current_price,
-                change=change,
-                change_percent=change_percent,
-                volume=hist['Volume'].iloc[-1],
-                avg_volume=info.get('averageVolume'),
-                high_52w=info.get('fiftyTwoWeekHigh'),
-                low_52w=info.get('fiftyTwoWeekLow'),
-                dividend_yield=info.get('dividendYield'),
-                beta=info.get('beta')
-            )
-            
-            result = {
-                "success": True,
-                "stock_info": stock_info.model_dump(),
-                "message": f"Successfully retrieved information for {symbol}"
-            }
-            
-            # Add financial data if requested
-            if include_financials:
-                financials = await self._get_financial_data(stock)
-                result["financials"] = financials
-            
-            # Add news if requested
-            if include_news:
-                news = await self._get_news_data(stock)
-                result["news"] = news
-            
-            return result
-            
-        except Exception as e:
-            return {
-                "error": f"Failed to get stock info: {str(e)}",
-                "success": False
-            }
+        symbol = params.get("symbol", "").upper()
+        include_financials = params.get("include_financials", False)
+        include_news = params.get("include_news", False)
+        
+        if not symbol:
+            return {"error": "Symbol is required"}
+        
+        # Get stock info using yfinance
+        stock = get_ticker(symbol)
+        
+        # Get quote data from fast_info and the price history, and company details from
+        # the long-lived info cache, without blocking the event loop
+        fast_info, info, hist = await asyncio.gather(
+            asyncio.to_thread(cached_fast_info, symbol),
+            asyncio.to_thread(cached_info, symbol),
+            asyncio.to_thread(cached_history, symbol, ttl=QUOTE_TTL, period="5d")
+        )
+        if hist.empty:
+            return {"error": f"No data found for symbol {symbol}"}
+        
+        close = hist['Close'].to_numpy()
+        current_price = close[-1]
+        prev_price = close[-2] if close.size > 1 else current_price
+        change = current_price - prev_price
+        change_percent = (change / prev_price) * 100 if prev_price != 0 else 0
+        
+        # Build stock info
+        stock_info = StockInfo(
+            symbol=symbol,
+            name=info.get('longName', info.get('shortName', symbol)),
+            sector=info.get('sector'),
+            industry=info.get('industry'),
+            market_cap=_first_present(fast_info["marketCap"], info.get('marketCap')),
+            pe_ratio=info.get('trailingPE'),
+            price=current_price,
+            change=change,
+            change_percent=change_percent,
+            volume=hist['Volume'].to_numpy()[-1],
+            avg_volume=_first_present(fast_info["threeMonthAverageVolume"], info.get('averageVolume')),
+            high_52w=_first_present(fast_info["yearHigh"], info.get('fiftyTwoWeekHigh')),
+            low_52w=_first_present(fast_info["yearLow"], info.get('fiftyTwoWeekLow')),
+            dividend_yield=info.get('dividendYield'),
+            beta=info.get('beta')
+        )
+        
+        result = {
+            "success": True,
+            "stock_info": stock_info.model_dump(),
+            "message": f"Successfully retrieved information for {symbol}"
+        }
+        
+        # Add financial data and news if requested, fetched concurrently
+        extras = {}
+        if include_financials:
+            extras["financials"] = asyncio.to_thread(self._get_financial_data, stock)
+        if include_news:
+            extras["news"] = asyncio.to_thread(self._get_news_data, stock)
+        if extras:
+            result.update(zip(extras, await asyncio.gather(*extras.values()), strict=True))
+        
+        return result
     
-    async def _get_financial_data(self, stock: yf.Ticker) -> Dict[str, Any]:
+    async def execute_batch(self, symbols: List[str], **params: Any) -> Dict[str, Any]:
+        """Get stock information for several symbols concurrently, reporting failures per symbol."""
+        # Upper-case and drop repeats so each symbol is fetched and reported once
+        symbols = list(dict.fromkeys(str(symbol).upper() for symbol in symbols))
+        
+        # Fetch quotes, fast info and info in parallel threads so the per-symbol runs hit the cache
+        await asyncio.gather(
+            *(asyncio.to_thread(cached_fast_info, symbol) for symbol in symbols),
+            *(asyncio.to_thread(cached_history, symbol, ttl=QUOTE_TTL, period="5d") for symbol in symbols),
+            *(asyncio.to_thread(cached_info, symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+        
+        # execute() turns its own exceptions into an error response, so a bad symbol fails alone
+        results = await asyncio.gather(
+            *(self.execute({**params, "symbol": symbol}) for symbol in symbols)
+        )
+        return {
+            "success": True,
+            "results": dict(zip(symbols, results, strict=True)),
+            "message": f"Retrieved information for {len(symbols)} symbols"
+        }
+    
+    def _get_financial_data(self, stock: yf.Ticker) -> Dict[str, Any]:
         """Get financial data for the stock."""
         try:
             # Get financial statements
@@ -93,33 +130,38 @@ class StockInfoTool(Tool):
             balance_sheet = stock.balance_sheet
             cash_flow = stock.cashflow
             
+            # Map each statement's row labels to their most recent value once
+            income = _latest_values(income_stmt)
+            balance = _latest_values(balance_sheet)
+            cash = _latest_values(cash_flow)
+            
             financials = {
                 "income_statement": {},
                 "balance_sheet": {},
                 "cash_flow": {}
             }
             
-            if not income_stmt.empty:
+            if income:
                 financials["income_statement"] = {
-                    "revenue": income_stmt.loc['Total Revenue'].iloc[0] if 'Total Revenue' in income_stmt.index else None,
-                    "net_income": income_stmt.loc['Net Income'].iloc[0] if 'Net Income' in income_stmt.index else None,
-                    "eps": income_stmt.loc['Basic EPS'].iloc[0] if 'Basic EPS' in income_stmt.index else None,
-                    "gross_margin": income_stmt.loc['Gross Profit'].iloc[0] if 'Gross Profit' in income_stmt.index else None
+                    "revenue": income.get('Total Revenue'),
+                    "net_income": income.get('Net Income'),
+                    "eps": income.get('Basic EPS'),
+                    "gross_margin": income.get('Gross Profit')
                 }
             
-            if not balance_sheet.empty:
+            if balance:
                 financials["balance_sheet"] = {
-                    "total_assets": balance_sheet.loc['Total Assets'].iloc[0] if 'Total Assets' in balance_sheet.index else None,
-                    "total_liabilities": balance_sheet.loc['Total Liabilities'].iloc[0] if 'Total Liabilities' in balance_sheet.index else None,
-                    "total_equity": balance_sheet.loc['Total Equity'].iloc[0] if 'Total Equity' in balance_sheet.index else None,
-                    "cash": balance_sheet.loc['Cash'].iloc[0] if 'Cash' in balance_sheet.index else None
+                    "total_assets": balance.get('Total Assets'),
+                    "total_liabilities": balance.get('Total Liabilities'),
+                    "total_equity": balance.get('Total Equity'),
+                    "cash": balance.get('Cash')
                 }
             
-            if not cash_flow.empty:
+            if cash:
                 financials["cash_flow"] = {
-                    "operating_cash_flow": cash_flow.loc['Operating Cash Flow'].iloc[0] if 'Operating Cash Flow' in cash_flow.index else None,
-                    "investing_cash_flow": cash_flow.loc['Investing Cash Flow'].iloc[0] if 'Investing Cash Flow' in cash_flow.index else None,
-                    "financing_cash_flow": cash_flow.loc['Financing Cash Flow'].iloc[0] if 'Financing Cash Flow' in cash_flow.index else None
+                    "operating_cash_flow": cash.get('Operating Cash Flow'),
+                    "investing_cash_flow": cash.get('Investing Cash Flow'),
+                    "financing_cash_flow": cash.get('Financing Cash Flow')
                 }
             
             return financials
@@ -127,7 +169,7 @@ class StockInfoTool(Tool):
         except Exception as e:
             return {"error": f"Failed to get financial data: {str(e)}"}
     
-    async def _get_news_data(self, stock: yf.Ticker) -> List[Dict[str, Any]]:
+    def _get_news_data(self, stock: yf.Ticker) -> List[Dict[str, Any]]:
         """Get recent news for the stock."""
         try:
             news = stock.news
@@ -145,54 +187,52 @@ class StockInfoTool(Tool):
             return [{"error": f"Failed to get news: {str(e)}"}]
 
 
+# For now, screen a small sample universe
+_UNIVERSE = np.array(
+    [
+        ("AAPL", "Apple Inc.", "Technology", 3000000000000, 25.5),
+        ("MSFT", "Microsoft Corporation", "Technology", 2800000000000, 30.2),
+        ("GOOGL", "Alphabet Inc.", "Technology", 1800000000000, 28.1),
+    ],
+    dtype=[("symbol", "U8"), ("name", "U64"), ("sector", "U32"), ("market_cap", "i8"), ("pe_ratio", "f8")]
+)
+
+
 class MarketScreenerTool(Tool):
     """Tool for screening stocks based on various criteria."""
     
     name = "screen_stocks"
     description = "Screen stocks based on technical and fundamental criteria"
     
+    @mcp_execute("Failed to screen stocks")
     async def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the stock screener tool."""
-        try:
-            # Get screening criteria
-            min_market_cap = params.get("min_market_cap", 1000000000)  # 1B default
-            max_pe_ratio = params.get("max_pe_ratio", 50)
-            min_volume = params.get("min_volume", 1000000)  # 1M default
-            sectors = params.get("sectors", [])
-            technical_filters = params.get("technical_filters", {})
-            
-            # This is a simplified implementation
-            # In a real implementation, you would query a database or use a screening API
-            
-            # For now, return a sample result
-            sample_stocks = [
-                {"symbol": "AAPL", "name": "Apple Inc.", "sector": "Technology", "market_cap": 3000000000000, "pe_ratio": 25.5},
-                {"symbol": "MSFT", "name": "Microsoft Corporation", "sector": "Technology", "market_cap": 2800000000000, "pe_ratio": 30.2},
-                {"symbol": "GOOGL", "name": "Alphabet Inc.", "sector": "Technology", "market_cap": 1800000000000, "pe_ratio": 28.1},
-            ]
-            
-            # Apply filters
-            filtered_stocks = []
-            for stock in sample_stocks:
-                if (stock["market_cap"] >= min_market_cap and
-                    stock["pe_ratio"] <= max_pe_ratio and
-                    (not sectors or stock["sector"] in sectors)):
-                    filtered_stocks.append(stock)
-            
-            return {
-                "success": True,
-                "stocks": filtered_stocks,
-                "total_count": len(filtered_stocks),
-                "criteria_used": {
-                    "min_market_cap": min_market_cap,
-                    "max_pe_ratio": max_pe_ratio,
-                    "min_volume": min_volume,
-                    "sectors": sectors
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "error": f"Failed to screen stocks: {str(e)}",
-                "success": False
+        # Get screening criteria
+        min_market_cap = params.get("min_market_cap", 1000000000)  # 1B default
+        max_pe_ratio = params.get("max_pe_ratio", 50)
+        min_volume = params.get("min_volume", 1000000)  # 1M default
+        sectors = params.get("sectors", [])
+        technical_filters = params.get("technical_filters", {})
+        
+        # This is a simplified implementation
+        # In a real implementation, you would query a database or use a screening API
+        
+        # Apply filters as boolean masks over the whole universe
+        mask = (_UNIVERSE["market_cap"] >= min_market_cap) & (_UNIVERSE["pe_ratio"] <= max_pe_ratio)
+        if sectors:
+            mask &= np.isin(_UNIVERSE["sector"], sectors)
+        
+        fields = _UNIVERSE.dtype.names
+        filtered_stocks = [dict(zip(fields, row, strict=True)) for row in _UNIVERSE[mask].tolist()]
+        
+        return {
+            "success": True,
+            "stocks": filtered_stocks,
+            "total_count": len(filtered_stocks),
+            "criteria_used": {
+                "min_market_cap": min_market_cap,
+                "max_pe_ratio": max_pe_ratio,
+                "min_volume": min_volume,
+                "sectors": sectors
             }
+        }
@@ -1,14 +1,17 @@
 """Technical Analysis MCP Tool."""
 
 import asyncio
-from typing import Dict, Any, Optional, List
-import yfinance as yf
+from functools import lru_cache
+from typing import Callable, Dict, Any, FrozenSet, Optional, List, Tuple
 import pandas as pd
 import numpy as np
 from datetime import datetime, date, timedelta
 
 from mcp import Tool
 from ..schemas import TechnicalIndicators, TrendDirection
+from ._cache import cached_history
+from ._decorators import mcp_execute
+from ._kernels import atr_last, bb_last, ewm_last, macd_last, obv_last, rsi_last, sma_last, stoch_last
 
 
 class TechnicalAnalysisTool(Tool):
@@ -17,184 +20,171 @@ class TechnicalAnalysisTool(Tool):
     name = "analyze_technical"
     description = "Perform comprehensive technical analysis including moving averages, momentum, and volatility indicators"
     
+    @mcp_execute("Failed to perform technical analysis")
     async def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the technical analysis tool."""
-        try:
-            symbol = params.get("symbol", "").upper()
-            period = params.get("period", "1y")
-            indicators = params.get("indicators", ["sma", "rsi", "macd", "bollinger"])
-            
-            if not symbol:
-                return {"error": "Symbol is required"}
-            
-            # Get historical data
-            stock = yf.Ticker(symbol)
-            hist = stock.history(period=period)
-            
-            if hist.empty:
-                return {"error": f"No data found for symbol {symbol}"}
-            
-            # Calculate technical indicators
-            technical_data = await self._calculate_indicators(hist, indicators)
-            
-            # Determine trend direction and strength
-            trend_analysis = await self._analyze_trend(hist, technical_data)
-            
-            # Create technical indicators object
-            latest_data = hist.iloc[-1]
-            technical_indicators = TechnicalIndicators(
-                symbol=symbol,
-                date=latest_data.name.date(),
-                sma_20=technical_data.get("sma_20", 0),
-                sma_50=technical_data.get("sma_50", 0),
-                sma_200=technical_data.get("sma_200", 0),
-                ema_12=technical_data.get("ema_12", 0),
-                ema_26=technical_data.get("ema_26", 0),
-                rsi=technical_data.get("rsi", 0),
-                macd=technical_data.get("macd", 0),
-                macd_signal=technical_data.get("macd_signal", 0),
-                macd_histogram=technical_data.get("macd_histogram", 0),
-                stoch_k=technical_data.get("stoch_k", 0),
-                stoch_d=technical_data.get("stoch_d", 0),
-                bollinger_upper=technical_data.get("bollinger_upper", 0),
-                bollinger_middle=technical_data.get("bollinger_middle", 0),
-                bollinger_lower=technical_data.get("bollinger_lower", 0),
-                atr=technical_data.get("atr", 0),
-                obv=technical_data.get("obv", 0),
-                volume_sma=technical_data.get("volume_sma", 0),
-                trend_direction=trend_analysis["direction"],
-                trend_strength=trend_analysis["strength"]
-            )
-            
-            return {
-                "success": True,
-                "technical_indicators": technical_indicators.model_dump(),
-                "analysis_summary": await self._generate_analysis_summary(technical_indicators),
-                "signal_strength": await self._calculate_signal_strength(technical_indicators),
-                "message": f"Technical analysis completed for {symbol}"
-            }
-            
-        except Exception as e:
-            return {
-                "error": f"Failed to perform technical analysis: {str(e)}",
-                "success": False
-            }
-    
-    async def _calculate_indicators(self, hist: pd.DataFrame, indicators: List[str]) -> Dict[str, float]:
-        """Calculate technical indicators."""
-        result = {}
-        
-        if "sma" in indicators:
-            result["sma_20"] = hist['Close'].rolling(window=20).mean().iloc[-1]
-            result["sma_50"] = hist['Close'].rolling(window=50).mean().iloc[-1]
-            result["sma_200"] = hist['Close'].rolling(window=200).mean().iloc[-1]
-        
-        if "ema" in indicators:
-            result["ema_12"] = hist['Close'].ewm(span=12).mean().iloc[-1]
-            result["ema_26"] = hist['Close'].ewm(span=26).mean().iloc[-1]
+        symbol = params.get("symbol", "").upper()
+        period = params.get("period", "1y")
+        indicators = params.get("indicators", ["sma", "rsi", "macd", "bollinger"])
         
-        if "rsi" in indicators:
-            result["rsi"] = self._calculate_rsi(hist['Close'])
+        if not symbol:
+            return {"error": "Symbol is required"}
         
-        if "macd" in indicators:
-            macd_data = self._calculate_macd(hist['Close'])
-            result["macd"] = macd_data["macd"]
-            result["macd_signal"] = macd_data["signal"]
-            result["macd_histogram"] = macd_data["histogram"]
+        # Get historical data
+        hist = await asyncio.to_thread(cached_history, symbol, period=period)
         
-        if "stochastic" in indicators:
-            stoch_data = self._calculate_stochastic(hist)
-            result["stoch_k"] = stoch_data["k"]
-            result["stoch_d"] = stoch_data["d"]
+        if hist.empty:
+            return {"error": f"No data found for symbol {symbol}"}
         
-        if "bollinger" in indicators:
-            bb_data = self._calculate_bollinger_bands(hist['Close'])
-            result["bollinger_upper"] = bb_data["upper"]
-            result["bollinger_middle"] = bb_data["middle"]
-            result["bollinger_lower"] = bb_data["lower"]
+        # Calculate technical indicators
+        technical_data = await self._calculate_indicators(hist, indicators)
         
-        if "atr" in indicators:
-            result["atr"] = self._calculate_atr(hist)
+        # Determine trend direction and strength
+        trend_analysis = await self._analyze_trend(hist, technical_data)
         
-        if "volume" in indicators:
-            result["obv"] = self._calculate_obv(hist)
-            result["volume_sma"] = hist['Volume'].rolling(window=20).mean().iloc[-1]
+        # Create technical indicators object
+        latest_data = hist.iloc[-1]
+        technical_indicators = TechnicalIndicators(
+            symbol=symbol,
+            date=latest_data.name.date(),
+            sma_20=technical_data.get("sma_20", 0),
+            sma_50=technical_data.get("sma_50", 0),
+            sma_200=technical_data.get("sma_200", 0),
+            ema_12=technical_data.get("ema_12", 0),
+            ema_26=technical_data.get("ema_26", 0),
+            rsi=technical_data.get("rsi", 0),
+            macd=technical_data.get("macd", 0),
+            macd_signal=technical_data.get("macd_signal", 0),
+            macd_histogram=technical_data.get("macd_histogram", 0),
+            stoch_k=technical_data.get("stoch_k", 0),
+            stoch_d=technical_data.get("stoch_d", 0),
+            bollinger_upper=technical_data.get("bollinger_upper", 0),
+            bollinger_middle=technical_data.get("bollinger_middle", 0),
+            bollinger_lower=technical_data.get("bollinger_lower", 0),
+            atr=technical_data.get("atr", 0),
+            obv=technical_data.get("obv", 0),
+            volume_sma=technical_data.get("volume_sma", 0),
+            trend_direction=trend_analysis["direction"],
+            trend_strength=trend_analysis["strength"]
+        )
         
+        return {
+            "success": True,
+            "technical_indicators": technical_indicators.model_dump(),
+            "analysis_summary": await self._generate_analysis_summary(technical_indicators, hist['Close'].to_numpy()[-1]),
+            "signal_strength": await self._calculate_signal_strength(technical_indicators),
+            "message": f"Technical analysis completed for {symbol}"
+        }
+    
+    async def _calculate_indicators(self, hist: pd.DataFrame, indicators: List[str]) -> Dict[str, float]:
+        """Calculate technical indicators."""
+        # Materialize each needed column once and hand every block only the series it reads
+        plan = _indicator_plan(frozenset(indicators))
+        arrays = {
+            column: hist[column].to_numpy(dtype=np.float64)
+            for column in {column for _, columns in plan for column in columns}
+        }
+        result = {}
+        for block, columns in plan:
+            block(self, result, *(arrays[column] for column in columns))
         return result
     
-    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> float:
-        """Calculate RSI."""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.iloc[-1]
+    def _sma_block(self, result: Dict[str, float], close: np.ndarray) -> None:
+        """Add simple moving averages."""
+        result["sma_20"] = sma_last(close, 20)
+        result["sma_50"] = sma_last(close, 50)
+        result["sma_200"] = sma_last(close, 200)
+    
+    def _ema_block(self, result: Dict[str, float], close: np.ndarray) -> None:
+        """Add exponential moving averages."""
+        result["ema_12"] = ewm_last(close, 12)
+        result["ema_26"] = ewm_last(close, 26)
     
-    def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, float]:
+    def _rsi_block(self, result: Dict[str, float], close: np.ndarray) -> None:
+        """Add RSI."""
+        result["rsi"] = self._calculate_rsi(close)
+    
+    def _macd_block(self, result: Dict[str, float], close: np.ndarray) -> None:
+        """Add MACD line, signal and histogram."""
+        macd_data = self._calculate_macd(close)
+        result["macd"] = macd_data["macd"]
+        result["macd_signal"] = macd_data["signal"]
+        result["macd_histogram"] = macd_data["histogram"]
+    
+    def _stochastic_block(self, result: Dict[str, float], high: np.ndarray, low: np.ndarray, close: np.ndarray) -> None:
+        """Add Stochastic %K and %D."""
+        stoch_data = self._calculate_stochastic(high, low, close)
+        result["stoch_k"] = stoch_data["k"]
+        result["stoch_d"] = stoch_data["d"]
+    
+    def _bollinger_block(self, result: Dict[str, float], close: np.ndarray) -> None:
+        """Add Bollinger Bands."""
+        bb_data = self._calculate_bollinger_bands(close)
+        result["bollinger_upper"] = bb_data["upper"]
+        result["bollinger_middle"] = bb_data["middle"]
+        result["bollinger_lower"] = bb_data["lower"]
+    
+    def _atr_block(self, result: Dict[str, float], high: np.ndarray, low: np.ndarray, close: np.ndarray) -> None:
+        """Add ATR."""
+        result["atr"] = self._calculate_atr(high, low, close)
+    
+    def _volume_block(self, result: Dict[str, float], close: np.ndarray, volume: np.ndarray) -> None:
+        """Add OBV and the volume moving average."""
+        result["obv"] = self._calculate_obv(close, volume)
+        result["volume_sma"] = sma_last(volume, 20)
+    
+    # Indicator name to calculation block and the columns it reads, in the order results are computed
+    _INDICATOR_BLOCKS = {
+        "sma": (_sma_block, ('Close',)),
+        "ema": (_ema_block, ('Close',)),
+        "rsi": (_rsi_block, ('Close',)),
+        "macd": (_macd_block, ('Close',)),
+        "stochastic": (_stochastic_block, ('High', 'Low', 'Close')),
+        "bollinger": (_bollinger_block, ('Close',)),
+        "atr": (_atr_block, ('High', 'Low', 'Close')),
+        "volume": (_volume_block, ('Close', 'Volume')),
+    }
+    
+    def _calculate_rsi(self, close: np.ndarray, period: int = 14) -> float:
+        """Calculate RSI with Wilder's smoothing."""
+        return rsi_last(close, period)
+    
+    def _calculate_macd(self, close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, float]:
         """Calculate MACD."""
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal).mean()
-        histogram = macd_line - signal_line
+        macd, signal_value, histogram = macd_last(close, fast, slow, signal)
         
         return {
-            "macd": macd_line.iloc[-1],
-            "signal": signal_line.iloc[-1],
-            "histogram": histogram.iloc[-1]
+            "macd": macd,
+            "signal": signal_value,
+            "histogram": histogram
         }
     
-    def _calculate_stochastic(self, hist: pd.DataFrame, k_period: int = 14, d_period: int = 3) -> Dict[str, float]:
+    def _calculate_stochastic(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, k_period: int = 14, d_period: int = 3) -> Dict[str, float]:
         """Calculate Stochastic Oscillator."""
-        low_min = hist['Low'].rolling(window=k_period).min()
-        high_max = hist['High'].rolling(window=k_period).max()
-        k_percent = 100 * ((hist['Close'] - low_min) / (high_max - low_min))
-        d_percent = k_percent.rolling(window=d_period).mean()
+        k_percent, d_percent = stoch_last(high, low, close, k_period, d_period)
         
         return {
-            "k": k_percent.iloc[-1],
-            "d": d_percent.iloc[-1]
+            "k": k_percent,
+            "d": d_percent
         }
     
-    def _calculate_bollinger_bands(self, prices: pd.Series, period: int = 20, std_dev: int = 2) -> Dict[str, float]:
+    def _calculate_bollinger_bands(self, close: np.ndarray, period: int = 20, std_dev: int = 2) -> Dict[str, float]:
         """Calculate Bollinger Bands."""
-        middle = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
-        upper = middle + (std * std_dev)
-        lower = middle - (std * std_dev)
+        upper, middle, lower = bb_last(close, period, float(std_dev))
         
         return {
-            "upper": upper.iloc[-1],
-            "middle": middle.iloc[-1],
-            "lower": lower.iloc[-1]
+            "upper": upper,
+            "middle": middle,
+            "lower": lower
         }
     
-    def _calculate_atr(self, hist: pd.DataFrame, period: int = 14) -> float:
+    def _calculate_atr(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> float:
         """Calculate Average True Range."""
-        high_low = hist['High'] - hist['Low']
-        high_close = np.abs(hist['High'] - hist['Close'].shift())
-        low_close = np.abs(hist['Low'] - hist['Close'].shift())
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = true_range.rolling(window=period).mean()
-        
-        return atr.iloc[-1]
+        return atr_last(high, low, close, period)
     
-    def _calculate_obv(self, hist: pd.DataFrame) -> float:
+    def _calculate_obv(self, close: np.ndarray, volume: np.ndarray) -> float:
         """Calculate On-Balance Volume."""
-        obv = pd.Series(index=hist.index, dtype=float)
-        obv.iloc[0] = hist['Volume'].iloc[0]
-        
-        for i in range(1, len(hist)):
-            if hist['Close'].iloc[i] > hist['Close'].iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] + hist['Volume'].iloc[i]
-            elif hist['Close'].iloc[i] < hist['Close'].iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] - hist['Volume'].iloc[i]
-            else:
-                obv.iloc[i] = obv.iloc[i-1]
-        
-        return obv.iloc[-1]
+        return obv_last(close, volume)
     
     async def _analyze_trend(self, hist: pd.DataFrame, technical_data: Dict[str, float]) -> Dict[str, Any]:
         """Analyze trend direction and strength."""
@@ -230,8 +220,16 @@ class TechnicalAnalysisTool(Tool):
             "price_change_50d": price_change_50d
         }
     
-    async def _generate_analysis_summary(self, indicators: TechnicalIndicators) -> Dict[str, Any]:
+    async def _generate_analysis_summary(self, indicators: TechnicalIndicators, current_price: float) -> Dict[str, Any]:
         """Generate analysis summary."""
+        # Place the current price against the Bollinger Bands when they were calculated
+        bollinger_position = "Middle"
+        if indicators.bollinger_upper > indicators.bollinger_lower:
+            if current_price >= indicators.bollinger_upper:
+                bollinger_position = "Upper Band"
+            elif current_price <= indicators.bollinger_lower:
+                bollinger_position = "Lower Band"
+        
         summary = {
             "trend": {
                 "direction": indicators.trend_direction.value,
@@ -243,7 +241,7 @@ class TechnicalAnalysisTool(Tool):
                 "stochastic_status": "Oversold" if indicators.stoch_k < 20 else "Overbought" if indicators.stoch_k > 80 else "Neutral"
             },
             "volatility": {
-                "bollinger_position": "Upper Band" if indicators.bollinger_upper < indicators.bollinger_upper else "Lower Band" if indicators.bollinger_lower > indicators.bollinger_lower else "Middle",
+                "bollinger_position": bollinger_position,
                 "atr_level": f"{indicators.atr:.2f}"
             },
             "support_resistance": {
@@ -299,3 +297,12 @@ class TechnicalAnalysisTool(Tool):
             "bearish_strength": bearish_strength,
             "neutral_strength": 100 - bullish_strength - bearish_strength
         }
+
+
+@lru_cache(maxsize=128)
+def _indicator_plan(indicators: FrozenSet[str]) -> Tuple[Tuple[Callable[..., None], Tuple[str, ...]], ...]:
+    """Resolve a set of requested indicator names to their calculation blocks and input columns."""
+    return tuple(
+        entry for name, entry in TechnicalAnalysisTool._INDICATOR_BLOCKS.items()
+        if name in indicators
+    )
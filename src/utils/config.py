@@ -1,11 +1,44 @@
 """Configuration Management."""
 
 import os
-from typing import Optional, Dict, Any
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Optional, Any, Dict, Mapping
 from pathlib import Path
-from dotenv import load_dotenv
+from dotenv import dotenv_values, find_dotenv
 
-from pydantic import BaseSettings, Field
+from pydantic import Field, model_validator
+from pydantic_core import to_json
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+# Resolve the .env file once instead of searching for it on every load
+_ENV_PATH = find_dotenv()
+
+# Values this module exported from .env, so a reload can refresh them
+_exported_env: Dict[str, str] = {}
+
+
+@lru_cache(maxsize=1)
+def _load_env(mtime_ns: Optional[int]) -> None:
+    """Load the .env file into the environment; cached until the file changes."""
+    if not _ENV_PATH:
+        return
+    for key, value in dotenv_values(_ENV_PATH).items():
+        if value is None:
+            continue
+        # Variables set in the real environment take precedence over .env
+        if key not in os.environ or os.environ[key] == _exported_env.get(key):
+            os.environ[key] = _exported_env[key] = value
+
+
+def _load_env_once() -> None:
+    """Load environment variables, skipping the parse if .env is unchanged since the last load."""
+    try:
+        mtime_ns = os.stat(_ENV_PATH).st_mtime_ns if _ENV_PATH else None
+    except OSError:
+        mtime_ns = None
+    _load_env(mtime_ns)
 
 
 class Config(BaseSettings):
@@ -15,6 +48,7 @@ class Config(BaseSettings):
     app_name: str = Field(default="trend-following-mcp", description="Application name")
     app_version: str = Field(default="0.1.0", description="Application version")
     debug: bool = Field(default=False, description="Debug mode")
+    environment: Optional[str] = Field(default=None, description="Deployment environment (development/production)")
     
     # API settings
     yahoo_finance_api_key: Optional[str] = Field(default=None, description="Yahoo Finance API key")
@@ -55,27 +89,24 @@ class Config(BaseSettings):
     cache_enabled: bool = Field(default=True, description="Enable caching")
     cache_ttl: int = Field(default=300, description="Cache TTL in seconds")
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
-    
-    def __init__(self, **kwargs):
-        """Initialize configuration."""
-        # Load environment variables
-        load_dotenv()
-        
-        super().__init__(**kwargs)
+    # Settings come from the environment only; .env is loaded into it once by _load_env_once()
+    model_config = SettingsConfigDict(
+        case_sensitive=False,
+        extra="ignore",
+        # Settings are read-only once loaded; reload_config() builds a new instance
+        frozen=True,
+        validate_assignment=False
+    )
     
     @property
     def is_development(self) -> bool:
         """Check if running in development mode."""
-        return self.debug or os.getenv("ENVIRONMENT") == "development"
+        return self.debug or self.environment == "development"
     
     @property
     def is_production(self) -> bool:
         """Check if running in production mode."""
-        return not self.debug and os.getenv("ENVIRONMENT") == "production"
+        return not self.debug and self.environment == "production"
     
     def get_api_key(self, service: str) -> Optional[str]:
         """Get API key for a specific service."""
@@ -85,20 +116,30 @@ class Config(BaseSettings):
         }
         return api_keys.get(service)
     
-    def get_trading_config(self) -> Dict[str, Any]:
+    def get_trading_config(self) -> Mapping[str, Any]:
         """Get trading configuration."""
-        return {
+        return self._trading_config
+    
+    def get_technical_config(self) -> Mapping[str, Any]:
+        """Get technical analysis configuration."""
+        return self._technical_config
+    
+    @cached_property
+    def _trading_config(self) -> Mapping[str, Any]:
+        """Read-only trading configuration, built on first access."""
+        return MappingProxyType({
             "default_risk_level": self.default_risk_level,
             "default_position_size": self.default_position_size,
             "max_position_size": self.max_position_size,
             "stop_loss_multiplier": self.stop_loss_multiplier,
             "take_profit_multiplier": self.take_profit_multiplier,
             "max_drawdown_limit": self.max_drawdown_limit,
-        }
+        })
     
-    def get_technical_config(self) -> Dict[str, Any]:
-        """Get technical analysis configuration."""
-        return {
+    @cached_property
+    def _technical_config(self) -> Mapping[str, Any]:
+        """Read-only technical analysis configuration, built on first access."""
+        return MappingProxyType({
             "default_lookback_period": self.default_lookback_period,
             "rsi_period": self.rsi_period,
             "macd_fast": self.macd_fast,
@@ -106,9 +147,20 @@ class Config(BaseSettings):
             "macd_signal": self.macd_signal,
             "bollinger_period": self.bollinger_period,
             "bollinger_std": self.bollinger_std,
-        }
+        })
     
-    def validate(self) -> bool:
+    @cached_property
+    def trading_config_json(self) -> bytes:
+        """Trading configuration serialized to JSON once, for response payloads."""
+        return to_json(dict(self._trading_config))
+    
+    @cached_property
+    def technical_config_json(self) -> bytes:
+        """Technical analysis configuration serialized to JSON once, for response payloads."""
+        return to_json(dict(self._technical_config))
+    
+    @model_validator(mode="after")
+    def _validate_settings(self) -> "Config":
         """Validate configuration."""
         # Check required settings
         if not self.database_url and self.is_production:
@@ -128,20 +180,33 @@ class Config(BaseSettings):
         if self.macd_fast >= self.macd_slow:
             raise ValueError("MACD fast period must be less than slow period")
         
-        return True
+        return self
 
 
-# Global configuration instance
-config = Config()
+# Global configuration instance, created on first use
+_config: Optional[Config] = None
 
 
 def get_config() -> Config:
     """Get global configuration instance."""
-    return config
+    global _config
+    if _config is None:
+        _load_env_once()
+        _config = Config()
+    return _config
 
 
 def reload_config() -> Config:
     """Reload configuration from environment."""
-    global config
-    config = Config()
-    return config
+    global _config
+    _load_env.cache_clear()
+    _load_env_once()
+    _config = Config()
+    return _config
+
+
+def __getattr__(name: str) -> Any:
+    """Build the module-level ``config`` lazily on first access."""
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
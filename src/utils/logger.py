@@ -2,13 +2,124 @@
 
 import logging
 import logging.handlers
+import os
 import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 from .config import get_config
 
 
+# Level name to numeric level, resolved once
+_LEVELS = logging.getLevelNamesMapping()
+
+# File log buffering: records held in memory, and how often the buffer is written out
+LOG_BUFFER_CAPACITY = 1024
+LOG_FLUSH_INTERVAL = 30.0  # seconds
+
+# Shared formatters
+DETAILED_FORMATTER = logging.Formatter(
+    '{asctime} - {name} - {levelname} - {funcName}:{lineno} - {message}', style='{'
+)
+SIMPLE_FORMATTER = logging.Formatter(
+    '{asctime} - {levelname} - {message}', style='{'
+)
+
+# No formatter uses thread, process or task details, so skip collecting them for every record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging.logAsyncioTasks = False
+
+# Settings each logger was last set up with, so repeated setup calls can be skipped
+_logger_settings: Dict[str, Tuple[Any, ...]] = {}
+
+
+class FastRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that checks the file type once per open rather than per record."""
+    
+    def _open(self):
+        """Open the log file and remember whether it is a regular file."""
+        stream = super()._open()
+        self._is_regular_file = os.path.isfile(self.baseFilename)
+        return stream
+    
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        """Roll over when the record would push the file past maxBytes."""
+        if self.stream is None:  # delay was set
+            self.stream = self._open()
+        if self.maxBytes <= 0:
+            return False
+        pos = self.stream.tell()
+        # Never roll over an empty file, and only size-check before touching the filesystem
+        if not pos or pos + len(self.format(record)) + 1 < self.maxBytes:
+            return False
+        # Never roll over anything other than regular files
+        return self._is_regular_file
+
+
+class PeriodicMemoryHandler(logging.handlers.MemoryHandler):
+    """Memory handler that also writes its buffer out on a fixed interval."""
+    
+    def __init__(
+        self,
+        capacity: int,
+        flushLevel: int = logging.ERROR,
+        target: Optional[logging.Handler] = None,
+        interval: float = LOG_FLUSH_INTERVAL
+    ):
+        """Initialize the handler and start the background flusher."""
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, args=(interval,), name="log-flusher", daemon=True
+        )
+        self._flusher.start()
+    
+    def _flush_periodically(self, interval: float) -> None:
+        """Flush the buffer every ``interval`` seconds until the handler is closed."""
+        while not self._stopped.wait(interval):
+            self.flush()
+    
+    def close(self) -> None:
+        """Stop the background flusher, then flush and close."""
+        self._stopped.set()
+        super().close()
+
+
+@lru_cache(maxsize=None)
+def _get_console_handler() -> logging.Handler:
+    """Get the shared stdout handler."""
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(SIMPLE_FORMATTER)
+    return console_handler
+
+
+@lru_cache(maxsize=None)
+def _get_debug_handler() -> logging.Handler:
+    """Get the shared stderr handler used in development."""
+    debug_handler = logging.StreamHandler(sys.stderr)
+    debug_handler.setLevel(logging.DEBUG)
+    debug_handler.setFormatter(DETAILED_FORMATTER)
+    return debug_handler
+
+
+def _release_handlers(logger: logging.Logger) -> None:
+    """Detach the logger's handlers, closing the ones it owns."""
+    shared = (_get_console_handler(), _get_debug_handler())
+    for handler in logger.handlers:
+        if handler in shared:
+            continue
+        target = getattr(handler, "target", None)
+        handler.close()
+        if target is not None:
+            target.close()
+    logger.handlers.clear()
+
+
 def setup_logger(
     name: str = "trend-following-mcp",
     level: Optional[str] = None,
@@ -27,24 +138,19 @@ def setup_logger(
     
     # Create logger
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, level.upper()))
     
-    # Clear existing handlers
-    logger.handlers.clear()
+    # Nothing to do if the logger is already set up this way
+    settings = (level.upper(), log_file, max_bytes, backup_count, config.is_development)
+    if logger.handlers and _logger_settings.get(name) == settings:
+        return logger
     
-    # Create formatters
-    detailed_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
-    )
-    simple_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s'
-    )
+    logger.setLevel(_LEVELS[level.upper()])
+    
+    # Clear existing handlers
+    _release_handlers(logger)
     
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(simple_formatter)
-    logger.addHandler(console_handler)
+    logger.addHandler(_get_console_handler())
     
     # File handler (if log_file is specified)
     if log_file:
@@ -52,22 +158,28 @@ def setup_logger(
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Use rotating file handler for large log files
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = FastRotatingFileHandler(
             log_file,
             maxBytes=max_bytes,
             backupCount=backup_count
         )
         file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(detailed_formatter)
-        logger.addHandler(file_handler)
+        file_handler.setFormatter(DETAILED_FORMATTER)
+        
+        # Batch file writes; errors and above are written out immediately
+        buffered_handler = PeriodicMemoryHandler(
+            LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        )
+        buffered_handler.setLevel(logging.DEBUG)
+        logger.addHandler(buffered_handler)
     
     # Debug handler (only in development)
     if config.is_development:
-        debug_handler = logging.StreamHandler(sys.stderr)
-        debug_handler.setLevel(logging.DEBUG)
-        debug_handler.setFormatter(detailed_formatter)
-        logger.addHandler(debug_handler)
+        logger.addHandler(_get_debug_handler())
     
+    _logger_settings[name] = settings
     return logger
 
 
@@ -79,37 +191,49 @@ def get_logger(name: str = "trend-following-mcp") -> logging.Logger:
 class LoggerMixin:
     """Mixin class to add logging capabilities."""
     
-    @property
-    def logger(self) -> logging.Logger:
-        """Get logger for this class."""
-        return get_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+    logger: logging.Logger
+    
+    def __init_subclass__(cls, **kwargs):
+        """Resolve the logger for each subclass once, at class creation."""
+        super().__init_subclass__(**kwargs)
+        cls.logger = get_logger(f"{cls.__module__}.{cls.__name__}")
 
 
 def log_function_call(func):
     """Decorator to log function calls."""
+    logger = get_logger()
+    
     def wrapper(*args, **kwargs):
-        logger = get_logger()
-        logger.debug(f"Calling {func.__name__} with args={args}, kwargs={kwargs}")
+        # Skip building argument reprs unless debug output is enabled
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Calling %s with args=%s, kwargs=%s", func.__name__, args, kwargs)
         try:
             result = func(*args, **kwargs)
-            logger.debug(f"{func.__name__} returned {result}")
+            if debug:
+                logger.debug("%s returned %s", func.__name__, result)
             return result
         except Exception as e:
-            logger.error(f"{func.__name__} raised {type(e).__name__}: {e}")
+            logger.error("%s raised %s: %s", func.__name__, type(e).__name__, e)
             raise
     return wrapper
 
 
 def log_async_function_call(func):
     """Decorator to log async function calls."""
+    logger = get_logger()
+    
     async def wrapper(*args, **kwargs):
-        logger = get_logger()
-        logger.debug(f"Calling async {func.__name__} with args={args}, kwargs={kwargs}")
+        # Skip building argument reprs unless debug output is enabled
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Calling async %s with args=%s, kwargs=%s", func.__name__, args, kwargs)
         try:
             result = await func(*args, **kwargs)
-            logger.debug(f"Async {func.__name__} returned {result}")
+            if debug:
+                logger.debug("Async %s returned %s", func.__name__, result)
             return result
         except Exception as e:
-            logger.error(f"Async {func.__name__} raised {type(e).__name__}: {e}")
+            logger.error("Async %s raised %s: %s", func.__name__, type(e).__name__, e)
             raise
     return wrapper
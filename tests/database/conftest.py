@@ -0,0 +1,74 @@
+"""데이터베이스 테스트 공용 픽스처"""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from testcontainers.postgres import PostgresContainer
+
+
+def get_project_root():
+    """프로젝트 루트 디렉토리를 찾는 함수"""
+    # 현재 파일의 위치: tests/database/conftest.py
+    current_file = Path(__file__)  # 현재 파일의 경로
+
+    # tests/database에서 두 단계 상위로 이동하여 프로젝트 루트 찾기
+    project_root = current_file.parent.parent.parent
+    return project_root
+
+
+DDL_PATH = get_project_root() / "sql" / "ddl.sql"
+
+# DDL SQL 파일은 모듈 로드 시 한 번만 읽음 (파일이 없으면 사용할 때 오류 발생)
+try:
+    _DDL_SQL = DDL_PATH.read_bytes()
+except FileNotFoundError:
+    _DDL_SQL = None
+
+
+def read_ddl_file():
+    """DDL SQL 파일 내용을 반환하는 함수"""
+    if _DDL_SQL is None:
+        raise FileNotFoundError(f"DDL 파일을 찾을 수 없습니다: {DDL_PATH}")
+    return _DDL_SQL.decode()
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """테스트 세션 전체가 하나의 컨테이너와 엔진을 공유하는 픽스처"""
+    # 1. 컨테이너 실행 (테스트 세션당 한 번)
+    with PostgresContainer("timescale/timescaledb:latest-pg17") as postgres:
+        # 2. 엔진 생성
+        engine = create_engine(postgres.get_connection_url())
+
+        # 3. DDL SQL 파일 읽기 및 실행
+        # SQLAlchemy의 text() 컴파일을 거치지 않고 DBAPI 커서로 여러 문장을 한 번에 실행
+        raw_connection = engine.raw_connection()
+        try:
+            with raw_connection.cursor() as cursor:
+                cursor.execute(read_ddl_file())
+            raw_connection.commit()
+        finally:
+            raw_connection.close()
+
+        yield engine
+
+        # 4. 엔진 정리 (컨테이너는 with 블록 종료 시 중지)
+        engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """각 테스트를 외부 트랜잭션으로 감싸고 종료 시 롤백하는 세션 픽스처"""
+    connection = engine.connect()
+    transaction = connection.begin()
+
+    # 테스트 안의 commit()은 SAVEPOINT만 해제하므로 데이터가 실제로 커밋되지 않음
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+
+    yield session
+
+    session.close()
+    transaction.rollback()
+    connection.close()
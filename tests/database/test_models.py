@@ -1,77 +1,34 @@
 import datetime
 from decimal import Decimal
-from pathlib import Path
 from unittest import TestCase
-from testcontainers.postgres import PostgresContainer
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import pytest
+from sqlalchemy import insert
 from sqlalchemy.sql import text
 
 from database.models import (
     EtfSector, EtfComponent, MarketMetadata, MarketTimeseries, PriceData, TradingSignal,
     BacktestResult, EconomicCycle, SectorPerformance)
 
+# 여러 테스트에서 반복되는 Decimal 값은 한 번만 생성
+_D189_50 = Decimal('189.50')
+_D186_40 = Decimal('186.40')
+_D0_2340 = Decimal('0.2340')
+_D26140_00 = Decimal('26140.00')
+_D0_15 = Decimal('0.15')
+_D0_0945 = Decimal('0.0945')
 
-def get_project_root():
-    """프로젝트 루트 디렉토리를 찾는 함수"""
-    # 현재 테스트 파일의 위치: tests/database/test_models.py
-    current_file = Path(__file__)  # 현재 파일의 경로
-
-    # tests/database에서 두 단계 상위로 이동하여 프로젝트 루트 찾기
-    project_root = current_file.parent.parent.parent
-    return project_root
-
-
-def read_ddl_file():
-    """DDL SQL 파일을 읽는 함수"""
-    project_root = get_project_root()
-    ddl_path = project_root / "sql" / "ddl.sql"
-
-    # 파일 존재 여부 확인
-    if not ddl_path.exists():
-        raise FileNotFoundError(f"DDL 파일을 찾을 수 없습니다: {ddl_path}")
-
-    # 파일 내용 읽기
-    with open(ddl_path, "r") as f:
-        sql_commands = f.read()
-
-    return sql_commands
+# 실행마다 같은 타임스탬프를 쓰도록 고정한 기준 시각
+_NOW = datetime.datetime(2024, 1, 15, 12, 0, 0)
 
 
 class TestDatabaseOperations(TestCase):
     """데이터베이스 작업 테스트 클래스"""
 
-    @classmethod
-    def setUpClass(cls):
-        # 1. 컨테이너 실행
-        cls.postgres = PostgresContainer("timescale/timescaledb:latest-pg17")
-        cls.postgres.start()
-
-        # 2. 엔진 및 세션 생성
-        cls.engine = create_engine(cls.postgres.get_connection_url())
-        cls.Session = sessionmaker(bind=cls.engine, autocommit=False)
-
-        # 3. DDL SQL 파일 읽기 및 실행
-        sql_commands = read_ddl_file()
-
-        # 4. SQL 명령 실행
-        with cls.engine.connect() as conn:
-            conn.execute(text(sql_commands))
-            conn.commit()
-
-    @classmethod
-    def tearDownClass(cls):
-        # 1. 컨테이너 종료
-        cls.postgres.stop()
-
-    def setUp(self):
-        # 각 테스트 시작 시 세션 생성
-        self.session = self.Session()
-
-    def tearDown(self):
-        self.session.rollback()
-        self.session.close()
+    @pytest.fixture(autouse=True)
+    def _bind_session(self, session):
+        # 각 테스트는 종료 시 롤백되는 트랜잭션 안의 세션을 사용
+        self.session = session
 
     def test_etf_sector_insertion(self):
         """
@@ -84,7 +41,7 @@ class TestDatabaseOperations(TestCase):
             country='USA',
             sector='Broad Market',
             description='The SPDR S&P 500 ETF Trust tracks the S&P 500 index',
-            expense_ratio=Decimal('0.0945'),
+            expense_ratio=_D0_0945,
             inception_date=datetime.date(1993, 1, 22),
             assets_under_management=Decimal('374200000000.00')
         )
@@ -150,7 +107,7 @@ class TestDatabaseOperations(TestCase):
             end_date=datetime.date(2022, 12, 31),
             phase="Expansion",
             description="Economic expansion phase with increasing GDP and employment.",
-            confidence=Decimal('0.0945'),
+            confidence=_D0_0945,
         )
         self.session.add(economic_cycle)
         self.session.commit()
@@ -173,62 +130,61 @@ class TestDatabaseOperations(TestCase):
         self.session.add(gdp)
         self.session.flush()
 
-        # 시계열 데이터 추가
-        q1 = MarketTimeseries(
-            indicator_id=gdp.indicator_id,
-            date=datetime.date(2024, 1, 1),
-            indicator_value=Decimal('26140.00')
-        )
-        q2 = MarketTimeseries(
-            indicator_id=gdp.indicator_id,
-            date=datetime.date(2024, 4, 1),
-            indicator_value=Decimal('26580.00')
-        )
-
-        self.session.add_all([q1, q2])
+        # 시계열 데이터 추가 (단일 multi-row INSERT)
+        self.session.execute(insert(MarketTimeseries), [
+            {
+                "indicator_id": gdp.indicator_id,
+                "date": datetime.date(2024, 1, 1),
+                "indicator_value": _D26140_00
+            },
+            {
+                "indicator_id": gdp.indicator_id,
+                "date": datetime.date(2024, 4, 1),
+                "indicator_value": Decimal('26580.00')
+            }
+        ])
         self.session.commit()
 
         # 결과 확인
         results = self.session.query(MarketTimeseries).filter_by(indicator_id=gdp.indicator_id).order_by(
             MarketTimeseries.date).all()
         self.assertEqual(len(results), 2)
-        self.assertEqual(results[0].indicator_value, Decimal('26140.00'))
+        self.assertEqual(results[0].indicator_value, _D26140_00)
 
     def test_price_data_insertion(self):
         """
         가격 데이터 삽입 및 쿼리 테스트
         """
-        # 가격 데이터 삽입
-        yesterday = datetime.datetime.now() - datetime.timedelta(days=1)
-        today = datetime.datetime.now()
-
-        aapl_yesterday = PriceData(
-            symbol='AAPL',
-            time=yesterday,
-            open=Decimal('185.50'),
-            high=Decimal('187.20'),
-            low=Decimal('184.30'),
-            close=Decimal('186.40'),
-            adjusted_close=Decimal('186.40'),
-            volume=65000000,
-            is_etf=False,
-            country='USA'
-        )
-
-        aapl_today = PriceData(
-            symbol='AAPL',
-            time=today,
-            open=Decimal('186.40'),
-            high=Decimal('189.80'),
-            low=Decimal('186.10'),
-            close=Decimal('189.50'),
-            adjusted_close=Decimal('189.50'),
-            volume=72000000,
-            is_etf=False,
-            country='USA'
-        )
-
-        self.session.add_all([aapl_yesterday, aapl_today])
+        # 가격 데이터 삽입 (단일 multi-row INSERT)
+        yesterday = _NOW - datetime.timedelta(days=1)
+        today = _NOW
+
+        self.session.execute(insert(PriceData), [
+            {
+                "symbol": 'AAPL',
+                "time": yesterday,
+                "open": Decimal('185.50'),
+                "high": Decimal('187.20'),
+                "low": Decimal('184.30'),
+                "close": _D186_40,
+                "adjusted_close": _D186_40,
+                "volume": 65000000,
+                "is_etf": False,
+                "country": 'USA'
+            },
+            {
+                "symbol": 'AAPL',
+                "time": today,
+                "open": _D186_40,
+                "high": Decimal('189.80'),
+                "low": Decimal('186.10'),
+                "close": _D189_50,
+                "adjusted_close": _D189_50,
+                "volume": 72000000,
+                "is_etf": False,
+                "country": 'USA'
+            }
+        ])
         self.session.commit()
 
         # TimescaleDB 시간 기반 쿼리 테스트
@@ -238,21 +194,21 @@ class TestDatabaseOperations(TestCase):
         ).all()
 
         self.assertEqual(len(result), 1)
-        self.assertEqual(result[0].close, Decimal('189.50'))
+        self.assertEqual(result[0].close, _D189_50)
 
     def test_trading_signals_insertion(self):
         """
         트레이딩 신호 삽입 및 쿼리 테스트
         """
         # 트레이딩 신호 추가
-        now = datetime.datetime.now()
+        now = _NOW
 
         signal1 = TradingSignal(
             symbol='AAPL',
             time=now,
             signal_type='BUY',
             signal_strength=Decimal('0.85'),
-            price=Decimal('189.50'),
+            price=_D189_50,
             volume=1000,
             strategy_name='Moving Average Crossover',
             rationale='50-day MA crossed above 200-day MA'
@@ -291,8 +247,8 @@ class TestDatabaseOperations(TestCase):
             strategy_name='Momentum Strategy',
             start_date=datetime.date(2023, 1, 1),
             end_date=datetime.date(2024, 1, 1),
-            total_return=Decimal('0.2340'),
-            annualized_return=Decimal('0.2340'),
+            total_return=_D0_2340,
+            annualized_return=_D0_2340,
             sharpe_ratio=Decimal('1.45'),
             max_drawdown=Decimal('0.1250'),
             win_rate=Decimal('65.40'),
@@ -308,7 +264,7 @@ class TestDatabaseOperations(TestCase):
 
         # 결과 확인
         result = self.session.query(BacktestResult).filter_by(strategy_name='Momentum Strategy').first()
-        self.assertEqual(result.total_return, Decimal('0.2340'))
+        self.assertEqual(result.total_return, _D0_2340)
         self.assertEqual(result.parameters['lookback_period'], 20)
 
     def test_sector_performance_insertion(self):
@@ -320,7 +276,7 @@ class TestDatabaseOperations(TestCase):
             phase='Expansion',
             sector='Technology',
             country='USA',
-            historical_return=Decimal('0.15'),
+            historical_return=_D0_15,
             volatility=Decimal('0.20'),
             sharpe_ratio=Decimal('0.75'),
             success_rate=Decimal('0.80')
@@ -332,4 +288,4 @@ class TestDatabaseOperations(TestCase):
         # 결과 확인
         result = self.session.query(SectorPerformance).filter_by(phase='Expansion').first()
         self.assertEqual(result.sector, 'Technology')
-        self.assertEqual(result.historical_return, Decimal('0.15'))
+        self.assertEqual(result.historical_return, _D0_15)
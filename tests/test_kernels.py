@@ -0,0 +1,170 @@
+"""Tests for the indicator kernels against their pandas references."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.mcp.tools import _kernels
+
+
+def _implementations(*funcs, skip_without_scipy=()):
+    """Each kernel as dispatched plus, when numba compiled it, its interpreted form."""
+    params = []
+    for func in funcs:
+        marks = pytest.mark.skipif(
+            func in skip_without_scipy and _kernels.lfilter is None, reason="scipy not installed"
+        )
+        params.append(pytest.param(func, marks=marks, id=func.__name__))
+        py_func = getattr(func, "py_func", None)
+        if py_func is not None:
+            params.append(pytest.param(py_func, id=f"{func.__name__}-python"))
+    return params
+
+
+@pytest.fixture
+def ohlcv():
+    """Seeded random-walk OHLCV panel."""
+    rng = np.random.default_rng(42)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300)))
+    high = close * (1 + rng.uniform(0, 0.02, 300))
+    low = close * (1 - rng.uniform(0, 0.02, 300))
+    volume = rng.integers(100000, 1000000, 300).astype(np.float64)
+    return pd.DataFrame({'High': high, 'Low': low, 'Close': close, 'Volume': volume})
+
+
+def _wilder_rsi(close: pd.Series, period: int) -> float:
+    """Wilder RSI: seed with the simple average of the first changes, then smooth by 1/period."""
+    delta = close.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+
+    def smooth(values: pd.Series) -> float:
+        seeded = pd.Series([values.iloc[1:period + 1].mean(), *values.iloc[period + 1:]])
+        return seeded.ewm(alpha=1 / period, adjust=False).mean().iloc[-1]
+
+    return 100 - 100 / (1 + smooth(gain) / smooth(loss))
+
+
+class TestMovingAverages:
+    """Test cases for SMA and Bollinger Bands."""
+
+    @pytest.mark.parametrize("sma_last", _implementations(_kernels.sma_last))
+    @pytest.mark.parametrize("window", [20, 50, 200])
+    def test_sma_last(self, ohlcv, sma_last, window):
+        """Test the last SMA matches a rolling mean."""
+        close = ohlcv['Close']
+        expected = close.rolling(window).mean().iloc[-1]
+        assert sma_last(close.to_numpy(), window) == pytest.approx(expected, rel=1e-12)
+        assert np.isnan(sma_last(close.to_numpy()[:window - 1], window))
+
+    @pytest.mark.parametrize("window", [20, 150])
+    def test_sma_full(self, ohlcv, window):
+        """Test the full SMA series matches a rolling mean on both the convolve and cumsum paths."""
+        close = ohlcv['Close']
+        expected = close.rolling(window).mean().to_numpy()
+        np.testing.assert_allclose(_kernels.sma_full(close.to_numpy(), window), expected, rtol=1e-10)
+
+    @pytest.mark.parametrize("bb_last", _implementations(_kernels.bb_last))
+    def test_bb_last(self, ohlcv, bb_last):
+        """Test Bollinger Bands match a rolling mean and sample standard deviation."""
+        close = ohlcv['Close']
+        middle = close.rolling(20).mean().iloc[-1]
+        std = close.rolling(20).std(ddof=1).iloc[-1]
+        upper, mid, lower = bb_last(close.to_numpy(), 20, 2.0)
+        assert mid == pytest.approx(middle, rel=1e-12)
+        assert upper == pytest.approx(middle + 2 * std, rel=1e-10)
+        assert lower == pytest.approx(middle - 2 * std, rel=1e-10)
+
+    def test_float32_input_accumulates_in_float64(self, ohlcv):
+        """Test float32 input gives float64 results close to the float64 calculation."""
+        close = ohlcv['Close'].to_numpy()
+        result = _kernels.sma_last(close.astype(np.float32), 50)
+        assert np.asarray(result).dtype == np.float64
+        assert result == pytest.approx(_kernels.sma_last(close, 50), rel=1e-6)
+
+
+class TestExponentialAverages:
+    """Test cases for EWM and MACD, compiled and through scipy's filter."""
+
+    @pytest.mark.parametrize(
+        "ewm", _implementations(_kernels._ewm_loop, _kernels._ewm_lfilter, skip_without_scipy=(_kernels._ewm_lfilter,))
+    )
+    def test_ewm(self, ohlcv, ewm):
+        """Test the EWM series matches pandas with adjust=True."""
+        close = ohlcv['Close']
+        expected = close.ewm(span=12, adjust=True).mean().to_numpy()
+        np.testing.assert_allclose(ewm(close.to_numpy(), 12), expected, rtol=1e-10)
+
+    @pytest.mark.parametrize(
+        "ewm_last",
+        _implementations(_kernels._ewm_last_loop, _kernels._ewm_last_lfilter, skip_without_scipy=(_kernels._ewm_last_lfilter,))
+    )
+    def test_ewm_last(self, ohlcv, ewm_last):
+        """Test the last EWM value matches pandas with adjust=True."""
+        close = ohlcv['Close']
+        expected = close.ewm(span=26, adjust=True).mean().iloc[-1]
+        assert ewm_last(close.to_numpy(), 26) == pytest.approx(expected, rel=1e-10)
+
+    @pytest.mark.parametrize(
+        "macd_last",
+        _implementations(_kernels._macd_last_loop, _kernels._macd_last_lfilter, skip_without_scipy=(_kernels._macd_last_lfilter,))
+    )
+    def test_macd_last(self, ohlcv, macd_last):
+        """Test MACD, signal and histogram match pandas EWMs."""
+        close = ohlcv['Close']
+        macd = close.ewm(span=12, adjust=True).mean() - close.ewm(span=26, adjust=True).mean()
+        signal = macd.ewm(span=9, adjust=True).mean()
+        result = macd_last(close.to_numpy(), 12, 26, 9)
+        expected = (macd.iloc[-1], signal.iloc[-1], macd.iloc[-1] - signal.iloc[-1])
+        # MACD values sit near zero, so compare on the price scale
+        np.testing.assert_allclose(result, expected, rtol=0, atol=1e-9 * close.iloc[-1])
+
+
+class TestOscillators:
+    """Test cases for RSI, Stochastic, ATR and OBV."""
+
+    @pytest.mark.parametrize("rsi_last", _implementations(_kernels.rsi_last))
+    def test_rsi_last(self, ohlcv, rsi_last):
+        """Test RSI matches a reference Wilder calculation."""
+        close = ohlcv['Close']
+        assert rsi_last(close.to_numpy(), 14) == pytest.approx(_wilder_rsi(close, 14), rel=1e-10)
+
+    @pytest.mark.parametrize("rsi_last", _implementations(_kernels.rsi_last))
+    def test_rsi_last_edge_cases(self, rsi_last):
+        """Test RSI for rising, flat and too-short series."""
+        assert rsi_last(np.linspace(1.0, 2.0, 50), 14) == 100.0
+        assert np.isnan(rsi_last(np.ones(50), 14))
+        assert np.isnan(rsi_last(np.linspace(1.0, 2.0, 14), 14))
+
+    @pytest.mark.parametrize("stoch_last", _implementations(_kernels.stoch_last))
+    def test_stoch_last(self, ohlcv, stoch_last):
+        """Test %K and %D match rolling min/max calculations."""
+        low_min = ohlcv['Low'].rolling(14).min()
+        high_max = ohlcv['High'].rolling(14).max()
+        k = 100 * (ohlcv['Close'] - low_min) / (high_max - low_min)
+        d = k.rolling(3).mean()
+        result = stoch_last(ohlcv['High'].to_numpy(), ohlcv['Low'].to_numpy(), ohlcv['Close'].to_numpy(), 14, 3)
+        np.testing.assert_allclose(result, (k.iloc[-1], d.iloc[-1]), rtol=1e-10)
+
+    @pytest.mark.parametrize("atr_last", _implementations(_kernels.atr_last))
+    def test_atr_last(self, ohlcv, atr_last):
+        """Test ATR matches a rolling mean of the true range."""
+        prev_close = ohlcv['Close'].shift()
+        true_range = np.maximum(
+            ohlcv['High'] - ohlcv['Low'],
+            np.maximum((ohlcv['High'] - prev_close).abs(), (ohlcv['Low'] - prev_close).abs())
+        )
+        expected = true_range.rolling(14).mean().iloc[-1]
+        result = atr_last(ohlcv['High'].to_numpy(), ohlcv['Low'].to_numpy(), ohlcv['Close'].to_numpy(), 14)
+        assert result == pytest.approx(expected, rel=1e-12)
+
+    @pytest.mark.parametrize("obv_last", _implementations(_kernels._obv_last_loop, _kernels._obv_last_vectorized))
+    def test_obv_last(self, ohlcv, obv_last):
+        """Test OBV matches the signed cumulative volume."""
+        direction = np.sign(ohlcv['Close'].diff()).fillna(0)
+        expected = ohlcv['Volume'].iloc[0] + (direction * ohlcv['Volume']).sum()
+        assert obv_last(ohlcv['Close'].to_numpy(), ohlcv['Volume'].to_numpy()) == pytest.approx(expected, rel=1e-12)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -2,6 +2,9 @@
 
 import pytest
 import asyncio
+import numpy as np
+import pandas as pd
+from typing import Any
 from unittest.mock import Mock, patch, AsyncMock
 
 from src.mcp.server import TrendFollowingMCPServer
@@ -9,6 +12,71 @@ from src.mcp.tools.stock_info import StockInfoTool
 from src.mcp.tools.technical import TechnicalAnalysisTool
 from src.mcp.tools.signals import TradingSignalTool
 from src.mcp.tools.portfolio import PortfolioTool
+from src.mcp.tools import _cache, _kernels, signals
+
+
+@pytest.fixture(autouse=True)
+def isolated_yf_cache(monkeypatch, tmp_path):
+    """Keep cached yfinance responses from leaking between tests."""
+    monkeypatch.setattr(_cache, "file_cache", _cache.FileCache(tmp_path))
+    _cache.clear_cache()
+
+
+def _price_history(close: np.ndarray, volume: float = 1000000) -> pd.DataFrame:
+    """Build a daily OHLCV frame around the given closes."""
+    return pd.DataFrame(
+        {
+            'Open': close,
+            'High': close + 1.0,
+            'Low': close - 1.0,
+            'Close': close,
+            'Volume': np.full(close.size, volume)
+        },
+        index=pd.bdate_range("2024-01-01", periods=close.size)
+    )
+
+
+@pytest.fixture(scope="module")
+def yf_ticker_mock():
+    """Factory for yfinance Ticker mocks whose history() returns the given frame."""
+    def build(history: pd.DataFrame, **attrs: Any) -> Mock:
+        mock_stock = Mock(**attrs)
+        mock_stock.history.return_value = history
+        return mock_stock
+    return build
+
+
+class TestCache:
+    """Test cases for the yfinance response cache."""
+    
+    @pytest.mark.parametrize("symbol", ["../../etc", "..", "AAPL/../X", "", "aapl"])
+    def test_rejects_non_ticker_symbols(self, tmp_path, symbol):
+        """Test symbols that could escape the cache directory are rejected."""
+        with pytest.raises(ValueError):
+            _cache.cached_info(symbol)
+        with pytest.raises(ValueError):
+            _cache.FileCache(tmp_path).set(symbol, "info", (), {})
+        assert not any(tmp_path.iterdir())
+    
+    def test_history_round_trips_through_json(self, tmp_path):
+        """Test cached price history is read back unchanged."""
+        file_cache = _cache.FileCache(tmp_path)
+        hist = _price_history(np.linspace(80.0, 120.0, 10))
+        hist.index = hist.index.tz_localize("America/New_York")
+        
+        file_cache.set("AAPL", "history", (("period", "1y"),), hist)
+        
+        _, cached = file_cache.get("AAPL", "history", (("period", "1y"),), ttl=60)
+        pd.testing.assert_frame_equal(cached, hist, check_freq=False)
+        assert all(path.suffix == ".json" for path in tmp_path.rglob("*.*"))
+    
+    def test_disk_hit_keeps_its_timestamp(self):
+        """Test a response read from disk expires with its file entry, not a fresh timestamp."""
+        _cache.file_cache.set("AAPL", "info", (), {"longName": "Apple Inc."})
+        stored_at, _ = _cache.file_cache.get("AAPL", "info", (), ttl=60)
+        
+        assert _cache.cached_info("AAPL") == {"longName": "Apple Inc."}
+        assert _cache._memory[("AAPL", "info", ())][0] == stored_at
 
 
 class TestTrendFollowingMCPServer:
@@ -48,9 +116,9 @@ class TestTrendFollowingMCPServer:
 class TestStockInfoTool:
     """Test cases for StockInfoTool."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def tool(self):
-        """Create tool instance for testing."""
+        """Create tool instance for testing; tools are stateless, so one per module."""
         return StockInfoTool()
     
     @pytest.mark.asyncio
@@ -62,25 +130,32 @@ class TestStockInfoTool:
     
     @pytest.mark.asyncio
     @patch('src.mcp.tools.stock_info.yf.Ticker')
-    async def test_execute_success(self, mock_ticker, tool):
+    async def test_execute_success(self, mock_ticker, tool, yf_ticker_mock):
         """Test successful execution."""
         # Mock yfinance response
-        mock_stock = Mock()
-        mock_stock.info = {
-            'longName': 'Apple Inc.',
-            'sector': 'Technology',
-            'marketCap': 3000000000000,
-            'trailingPE': 25.5,
-            'averageVolume': 1000000,
-            'fiftyTwoWeekHigh': 200.0,
-            'fiftyTwoWeekLow': 150.0,
-            'dividendYield': 0.02,
-            'beta': 1.2
-        }
-        mock_stock.history.return_value = Mock()
-        mock_stock.history.return_value.empty = False
-        mock_stock.history.return_value.__getitem__.return_value.iloc = [100.0, 99.0]
-        mock_ticker.return_value = mock_stock
+        mock_ticker.return_value = yf_ticker_mock(
+            pd.DataFrame({
+                'Close': [99.0, 100.0],
+                'Volume': [900000, 1000000]
+            }),
+            info={
+                'longName': 'Apple Inc.',
+                'sector': 'Technology',
+                'marketCap': 3000000000000,
+                'trailingPE': 25.5,
+                'averageVolume': 1000000,
+                'fiftyTwoWeekHigh': 200.0,
+                'fiftyTwoWeekLow': 150.0,
+                'dividendYield': 0.02,
+                'beta': 1.2
+            },
+            fast_info={
+                'marketCap': 3100000000000,
+                'yearHigh': 210.0,
+                'yearLow': 155.0,
+                'threeMonthAverageVolume': 1200000
+            }
+        )
         
         result = await tool.execute({"symbol": "AAPL"})
         
@@ -88,14 +163,33 @@ class TestStockInfoTool:
         assert "stock_info" in result
         assert result["stock_info"]["symbol"] == "AAPL"
         assert result["stock_info"]["name"] == "Apple Inc."
+        assert result["stock_info"]["market_cap"] == 3100000000000
+        assert result["stock_info"]["high_52w"] == 210.0
+    
+    @pytest.mark.asyncio
+    @patch('src.mcp.tools._cache.yf.Ticker')
+    async def test_execute_batch(self, mock_ticker, tool, yf_ticker_mock):
+        """Test batch execution dedupes symbols and reports a bad symbol on its own."""
+        mock_ticker.return_value = yf_ticker_mock(
+            pd.DataFrame({'Close': [99.0, 100.0], 'Volume': [900000, 1000000]}),
+            info={'longName': 'Apple Inc.'},
+            fast_info={}
+        )
+        
+        result = await tool.execute_batch(["AAPL", "aapl", "../etc"])
+        
+        assert result["success"] is True
+        assert list(result["results"]) == ["AAPL", "../ETC"]
+        assert result["results"]["AAPL"]["stock_info"]["name"] == "Apple Inc."
+        assert "Invalid symbol" in result["results"]["../ETC"]["error"]
 
 
 class TestTechnicalAnalysisTool:
     """Test cases for TechnicalAnalysisTool."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def tool(self):
-        """Create tool instance for testing."""
+        """Create tool instance for testing; tools are stateless, so one per module."""
         return TechnicalAnalysisTool()
     
     @pytest.mark.asyncio
@@ -106,18 +200,11 @@ class TestTechnicalAnalysisTool:
         assert "Symbol is required" in result["error"]
     
     @pytest.mark.asyncio
-    @patch('src.mcp.tools.technical.yf.Ticker')
-    async def test_execute_success(self, mock_ticker, tool):
+    @patch('src.mcp.tools._cache.yf.Ticker')
+    async def test_execute_success(self, mock_ticker, tool, yf_ticker_mock):
         """Test successful execution."""
         # Mock yfinance response
-        mock_stock = Mock()
-        mock_stock.history.return_value = Mock()
-        mock_stock.history.return_value.empty = False
-        mock_stock.history.return_value.__getitem__.return_value = Mock()
-        mock_stock.history.return_value.__getitem__.return_value.iloc = [100.0]
-        mock_stock.history.return_value.__getitem__.return_value.rolling.return_value.mean.return_value.iloc = [95.0, 90.0, 85.0]
-        mock_stock.history.return_value.__getitem__.return_value.ewm.return_value.mean.return_value.iloc = [95.0, 90.0]
-        mock_ticker.return_value = mock_stock
+        mock_ticker.return_value = yf_ticker_mock(_price_history(np.linspace(80.0, 120.0, 250)))
         
         result = await tool.execute({"symbol": "AAPL"})
         
@@ -129,9 +216,9 @@ class TestTechnicalAnalysisTool:
 class TestTradingSignalTool:
     """Test cases for TradingSignalTool."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def tool(self):
-        """Create tool instance for testing."""
+        """Create tool instance for testing; tools are stateless, so one per module."""
         return TradingSignalTool()
     
     @pytest.mark.asyncio
@@ -142,32 +229,79 @@ class TestTradingSignalTool:
         assert "Symbol is required" in result["error"]
     
     @pytest.mark.asyncio
-    @patch('src.mcp.tools.signals.yf.Ticker')
-    async def test_execute_success(self, mock_ticker, tool):
+    @patch('src.mcp.tools._cache.yf.Ticker')
+    async def test_execute_success(self, mock_ticker, tool, yf_ticker_mock):
         """Test successful execution."""
         # Mock yfinance response
-        mock_stock = Mock()
-        mock_stock.history.return_value = Mock()
-        mock_stock.history.return_value.empty = False
-        mock_stock.history.return_value.__getitem__.return_value = Mock()
-        mock_stock.history.return_value.__getitem__.return_value.iloc = [100.0]
-        mock_stock.history.return_value.__getitem__.return_value.rolling.return_value.mean.return_value.iloc = [95.0, 90.0, 85.0]
-        mock_stock.history.return_value.__getitem__.return_value.ewm.return_value.mean.return_value.iloc = [95.0, 90.0]
-        mock_ticker.return_value = mock_stock
+        mock_ticker.return_value = yf_ticker_mock(_price_history(np.linspace(80.0, 120.0, 250)))
         
         result = await tool.execute({"symbol": "AAPL"})
         
         assert result["success"] is True
         assert "signal" in result
         assert result["signal"]["symbol"] == "AAPL"
+        assert result["analysis"]["trend_direction"] == "up"
+        assert result["signal"]["position_size"] == pytest.approx(0.1 * result["signal"]["confidence"] / 100)
+    
+    @pytest.mark.asyncio
+    @patch('src.mcp.tools._cache.yf.Ticker')
+    async def test_execute_batch(self, mock_ticker, tool, yf_ticker_mock):
+        """Test batch execution dedupes symbols and reports a bad symbol on its own."""
+        mock_ticker.return_value = yf_ticker_mock(_price_history(np.linspace(80.0, 120.0, 250)))
+        
+        result = await tool.execute_batch(["MSFT", "msft", "../etc"])
+        
+        assert result["success"] is True
+        assert list(result["results"]) == ["MSFT", "../ETC"]
+        assert result["results"]["MSFT"]["success"] is True
+        assert "Invalid symbol" in result["results"]["../ETC"]["error"]
+    
+    @pytest.mark.parametrize("seed", range(5))
+    def test_float32_indicators_match_float64(self, tool, seed):
+        """Test float32 indicator values stay within 1e-4 of a float64 calculation."""
+        rng = np.random.default_rng(seed)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 500)))
+        analysis = tool._perform_technical_analysis(_price_history(close))
+        
+        macd, macd_signal, _ = _kernels.macd_last(close, 12, 26, 9)
+        bb_upper, bb_middle, bb_lower = _kernels.bb_last(close, 20, 2.0)
+        expected = {
+            "sma_20": _kernels.sma_last(close, 20),
+            "sma_50": _kernels.sma_last(close, 50),
+            "sma_200": _kernels.sma_last(close, 200),
+            "rsi": _kernels.rsi_last(close, 14),
+            "bb_upper": bb_upper,
+            "bb_middle": bb_middle,
+            "bb_lower": bb_lower
+        }
+        for name, value in expected.items():
+            assert getattr(analysis, name) == pytest.approx(value, rel=1e-4), name
+        # MACD sits near zero, so bound it against the price scale
+        assert abs(analysis.macd - macd) < 1e-4 * close[-1]
+        assert abs(analysis.macd_signal - macd_signal) < 1e-4 * close[-1]
+    
+    @pytest.mark.parametrize("python_floats", [False, True], ids=["kernel", "python-floats"])
+    def test_flat_series_compares_at_indicator_precision(self, tool, monkeypatch, python_floats):
+        """Test a flat price is not ranked against its own float32 rounding."""
+        if python_floats:
+            # Numba-compiled kernels return plain floats, which raise on division by zero
+            bands = _kernels.bb_last
+            monkeypatch.setattr(
+                signals, "bb_last", lambda *args: tuple(float(value) for value in bands(*args))
+            )
+        analysis = tool._perform_technical_analysis(_price_history(np.full(250, 100.1)))
+        
+        assert analysis.current_price == 100.1
+        assert analysis.trend_direction == "sideways"
+        assert np.isnan(analysis.price_position)
 
 
 class TestPortfolioTool:
     """Test cases for PortfolioTool."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def tool(self):
-        """Create tool instance for testing."""
+        """Create tool instance for testing; tools are stateless, so one per module."""
         return PortfolioTool()
     
     @pytest.mark.asyncio
@@ -178,7 +312,7 @@ class TestPortfolioTool:
         assert "Portfolio data is required" in result["error"]
     
     @pytest.mark.asyncio
-    async def test_analyze_portfolio_success(self, tool):
+    async def test_analyze_portfolio_success(self, tool, yf_ticker_mock):
         """Test successful portfolio analysis."""
         portfolio_data = [
             {
@@ -189,17 +323,27 @@ class TestPortfolioTool:
         ]
         
         with patch('src.mcp.tools.portfolio.yf.Ticker') as mock_ticker:
-            mock_stock = Mock()
-            mock_stock.history.return_value = Mock()
-            mock_stock.history.return_value.empty = False
-            mock_stock.history.return_value.__getitem__.return_value.iloc = [160.0]
-            mock_ticker.return_value = mock_stock
+            mock_ticker.return_value = yf_ticker_mock(pd.DataFrame({'Close': [160.0]}))
             
             result = await tool._analyze_portfolio({"portfolio": portfolio_data})
             
             assert result["success"] is True
             assert "portfolio_summary" in result
             assert result["portfolio_summary"]["total_value"] > 0
+            assert result["portfolio_summary"]["allocations"][0]["shares"] == 100
+            assert isinstance(result["portfolio_summary"]["allocations"][0]["shares"], int)
+    
+    @pytest.mark.asyncio
+    async def test_analyze_portfolio_rejects_fractional_shares(self, tool, yf_ticker_mock):
+        """Test user-supplied positions are validated against the allocation schema."""
+        portfolio_data = [{"symbol": "AAPL", "shares": 7.5, "cost_basis": 150.0}]
+        
+        with patch('src.mcp.tools.portfolio.yf.Ticker') as mock_ticker:
+            mock_ticker.return_value = yf_ticker_mock(pd.DataFrame({'Close': [160.0]}))
+            
+            result = await tool.execute({"action": "analyze", "portfolio": portfolio_data})
+            
+            assert "error" in result
 
 
 if __name__ == "__main__":